@@ -0,0 +1,145 @@
+"""Persistent build cache for MkDocs Material i18n Plugin"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, List, Optional
+
+from mkdocs.plugins import get_plugin_logger
+
+from . import __version__
+from .output import write_file
+
+log = get_plugin_logger(__name__)
+
+# Set to a non-empty value to drop all cached entries before a build
+CLEAR_CACHE_ENV = "MKDOCS_I18N_CLEAR_CACHE"
+
+_ENTRY_SUFFIX = ".json"
+
+
+class BuildCache:
+    """Stores derived build structures as JSON files, evicting the least recently used
+
+    Entries are keyed by everything they are derived from, so stale entries
+    are never read, only evicted once the cache exceeds its size cap. Reading
+    an entry touches its file, so the modification time of entries records
+    when they were last used, and survives the cache being saved and restored
+    by CI runners.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int):
+        """
+        Initialize the build cache
+
+        Args:
+            cache_dir: Directory the entries are stored in, created on first write
+            max_size: Maximum total size of the entries in bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, *parts: str) -> str:
+        """
+        Build the key of an entry from everything its value is derived from
+
+        The plugin version is part of every key, so upgrades never read
+        entries written by another version.
+
+        Args:
+            namespace: Kind of the entry, e.g. "nav"
+            parts: Fingerprints of the inputs of the entry
+
+        Returns:
+            Key usable as a file name
+        """
+        digest = hashlib.sha256(__version__.encode())
+        for part in parts:
+            digest.update(b"\0" + part.encode())
+        return f"{namespace}-{digest.hexdigest()[:32]}"
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Read an entry and mark it as recently used
+
+        Args:
+            key: Key built by make_key
+
+        Returns:
+            Cached value, None if missing or unreadable
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Write an entry, then evict entries beyond the size cap
+
+        Args:
+            key: Key built by make_key
+            value: JSON serializable value
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_file(self._get_path(key), json.dumps(value, separators=(",", ":")))
+        except OSError as e:
+            log.warning(f"Failed to write build cache entry {key}: {e}")
+            return
+        self.evict()
+
+    def _list_entries(self) -> List[os.DirEntry]:
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                return [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith(_ENTRY_SUFFIX) and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache fits its size cap
+
+        Returns:
+            Number of entries removed
+        """
+        entries = sorted(self._list_entries(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+
+        removed = 0
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            removed += 1
+
+        if removed:
+            log.debug(f"Evicted {removed} build cache entries")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry of the cache"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        log.info(f"Cleared build cache at {self.cache_dir}")
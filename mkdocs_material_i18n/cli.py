@@ -0,0 +1,102 @@
+"""Command line interface of MkDocs Material i18n Plugin"""
+
+import logging
+
+import click
+
+from .shards import ShardError, build_shard, merge_shards
+from .split import split_build
+
+
+@click.group()
+@click.option("-v", "--verbose", is_flag=True, help="Enable verbose output")
+def cli(verbose: bool) -> None:
+    """Build tools for multi-language MkDocs Material sites"""
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(levelname)-7s -  %(message)s",
+    )
+
+
+@cli.command("split-build")
+@click.option(
+    "-f",
+    "--config-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Provide a specific MkDocs config",
+)
+@click.option(
+    "-d", "--site-dir", type=click.Path(), help="The directory to output the result"
+)
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of locales built at the same time, defaults to the number of CPUs",
+)
+def split_build_command(config_file, site_dir, workers) -> None:
+    """Build every locale in a process of its own, then merge them into site_dir"""
+    split_build(config_file, site_dir, workers)
+
+
+def _parse_shard(ctx, param, value):
+    """Parse a shard given as "<index>/<count>", e.g. "2/4" """
+    if value is None:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise click.BadParameter("must be given as <index>/<count>, e.g. 2/4")
+    return index, count
+
+
+@cli.command("shard")
+@click.option(
+    "-f",
+    "--config-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Provide a specific MkDocs config",
+)
+@click.option(
+    "-d",
+    "--site-dir",
+    type=click.Path(),
+    required=True,
+    help="The directory to output the shard to",
+)
+@click.option("-l", "--locales", help="Comma separated langs of the locales to build")
+@click.option(
+    "-s",
+    "--shard",
+    callback=_parse_shard,
+    help="Build every <count>th locale starting at <index>, e.g. 2/4",
+)
+def shard_command(config_file, site_dir, locales, shard) -> None:
+    """Build some locales and write a manifest of the output, to merge later"""
+    langs = [lang.strip() for lang in locales.split(",")] if locales else None
+    index, count = shard or (1, 1)
+    try:
+        build_shard(config_file, site_dir, langs, index, count)
+    except ShardError as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command("merge")
+@click.option(
+    "-f",
+    "--config-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Provide a specific MkDocs config",
+)
+@click.option(
+    "-d", "--site-dir", type=click.Path(), help="The directory to output the result"
+)
+@click.argument(
+    "shard_dirs", nargs=-1, required=True, type=click.Path(exists=True, file_okay=False)
+)
+def merge_command(config_file, site_dir, shard_dirs) -> None:
+    """Combine the output of shards into site_dir and link their locales"""
+    try:
+        merge_shards(config_file, list(shard_dirs), site_dir)
+    except ShardError as e:
+        raise click.ClickException(str(e))
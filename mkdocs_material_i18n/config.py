@@ -1,8 +1,13 @@
 """Configuration classes for MkDocs Material i18n Plugin"""
 
+import os
+
 from mkdocs.config import base, config_options
 from mkdocs.config.defaults import MkDocsConfig
 
+# Comma separated langs overriding build_locales, e.g. "zh,ja"
+BUILD_LOCALES_ENV = "MKDOCS_I18N_BUILD_LOCALES"
+
 
 class LocaleConfig(base.Config):
     """Configuration for a single locale"""
@@ -11,7 +16,7 @@ class LocaleConfig(base.Config):
     link = config_options.Type(str, default="")
     lang = config_options.Type(str, default="")
     site_name = config_options.Type(str, default="")
-    nav = config_options.Nav(default=None)
+    nav = config_options.Optional(config_options.Nav())
 
     def validate(self):
         """Validate locale configuration and set defaults"""
@@ -80,6 +85,25 @@ class MaterialI18nPluginConfig(base.Config):
     locales = config_options.ListOfItems(
         config_options.SubConfig(LocaleConfig), default=[]
     )
+    derive_nav = config_options.Type(bool, default=False)
+    alternate_fallback = config_options.Choice(("home", "default"), default="home")
+    search_shards = config_options.Type(bool, default=False)
+    search_workers = config_options.Type(int, default=0)
+    search_segmenters = config_options.DictOfItems(config_options.Type(str), default={})
+    sitemaps = config_options.Type(bool, default=False)
+    redirect_rules = config_options.ListOfItems(
+        config_options.Choice(("nginx", "apache", "netlify")), default=[]
+    )
+    remember_language = config_options.Optional(
+        config_options.Choice(("cookie", "local_storage"))
+    )
+    prefetch = config_options.Type(bool, default=False)
+    default_locale_at_root = config_options.Type(bool, default=False)
+    redirect_stubs = config_options.Type(bool, default=False)
+    cache_dir = config_options.Optional(config_options.Type(str))
+    cache_max_size = config_options.Type(int, default=64)
+    build_locales = config_options.ListOfItems(config_options.Type(str), default=[])
+    dirty_locales = config_options.Type(bool, default=False)
 
     def validate(self):
         """Validate plugin configuration and set defaults"""
@@ -98,6 +122,38 @@ class MaterialI18nPluginConfig(base.Config):
                 )
             )
 
+        if self.search_workers < 0:
+            errors.append(("search_workers", "search_workers must not be negative"))
+
+        if self.cache_max_size < 0:
+            errors.append(("cache_max_size", "cache_max_size must not be negative"))
+
+        for lang, segmenter in self.search_segmenters.items():
+            module_name, _, attr = segmenter.partition(":")
+            if not module_name or not attr:
+                errors.append(
+                    (
+                        "search_segmenters",
+                        f"Segmenter of '{lang}' must be given as 'module:callable', got '{segmenter}'",
+                    )
+                )
+
+        # Let preview builds pick their locales without editing mkdocs.yml
+        build_locales = os.environ.get(BUILD_LOCALES_ENV)
+        if build_locales is not None:
+            self.build_locales = [
+                lang.strip() for lang in build_locales.split(",") if lang.strip()
+            ]
+
+        for lang in self.build_locales:
+            if not self._find_locale_by_lang(lang):
+                errors.append(
+                    (
+                        "build_locales",
+                        f"Locale '{lang}' of build_locales does not match any configured locale's lang",
+                    )
+                )
+
         # Set default_lang if not provided
         if not self.default_lang and not self.default_locale.lang:
             self.default_lang = self.locales[0].lang
@@ -135,6 +191,18 @@ class MaterialI18nPluginConfig(base.Config):
 
         return errors
 
+    def get_root_locale(self):
+        """Get the locale built at the site root, None unless default_locale_at_root is set"""
+        if not self.default_locale_at_root:
+            return None
+        return self._find_locale_by_lang(self.default_locale.lang)
+
+    def get_build_locales(self):
+        """Get the locales whose pages are built, all of them unless build_locales is set"""
+        if not self.build_locales:
+            return list(self.locales)
+        return [locale for locale in self.locales if locale.lang in self.build_locales]
+
     def _find_locale_by_lang(self, lang):
         """Find a locale by its lang attribute"""
         for locale in self.locales:
@@ -153,11 +221,12 @@ class MaterialI18nPluginConfig(base.Config):
 
             # Convert plugin's locales config to Material theme's alternate config
             alternate_configs = []
+            root_locale = self.get_root_locale()
             for locale in self.locales:
                 alternate_configs.append(
                     {
                         "name": locale.name,
-                        "link": locale.link,
+                        "link": "/" if locale is root_locale else locale.link,
                         "lang": locale.lang,
                     }
                 )
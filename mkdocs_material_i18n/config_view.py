@@ -0,0 +1,60 @@
+"""Read-through configuration view for MkDocs Material i18n Plugin"""
+
+from collections.abc import Mapping
+from typing import Any, Iterator, Union
+
+from mkdocs.config.defaults import MkDocsConfig
+
+
+class ConfigView(Mapping):
+    """
+    Read-only view of a MkDocs configuration with a few keys overridden.
+
+    Replaces ``config.copy()`` where only some keys differ per locale: every
+    other key is read from the wrapped configuration, so nothing is copied.
+    Both item access (``view["nav"]``) and attribute access (``view.nav``) are
+    supported, like on MkDocsConfig itself. Any mapping can be wrapped, e.g.
+    ``config.theme`` or ``config.extra`` for per-page template contexts.
+    """
+
+    __slots__ = ("_config", "_overrides")
+
+    def __init__(self, config: Union[MkDocsConfig, Mapping], **overrides: Any):
+        """
+        Initialize the configuration view
+
+        Args:
+            config: Configuration to read through to
+            **overrides: Keys whose values differ from the wrapped configuration
+        """
+        object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "_overrides", overrides)
+
+    def __getitem__(self, key: str) -> Any:
+        overrides = self._overrides
+        if key in overrides:
+            return overrides[key]
+        return self._config[key]
+
+    def __getattr__(self, name: str) -> Any:
+        overrides = self._overrides
+        if name in overrides:
+            return overrides[name]
+        return getattr(self._config, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._config
+        for key in self._overrides:
+            if key not in self._config:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._config) + sum(
+            1 for key in self._overrides if key not in self._config
+        )
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overrides or key in self._config
@@ -0,0 +1,228 @@
+"""Locale-scoped dirty tracking for `mkdocs serve` in MkDocs Material i18n Plugin"""
+
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.files import Files
+
+from .config import LocaleConfig
+from .locale_mapper import LocaleMapper
+
+log = get_plugin_logger(__name__)
+
+_ID_PATTERN = re.compile(r'\sid="([^"]+)"')
+
+
+def _stat_signature(path: str) -> str:
+    """Get the modification time and size of a file as a string"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "-"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def get_anchor_ids(output: str) -> Set[str]:
+    """Get the ids of the elements of a rendered page, which links may point to"""
+    return set(_ID_PATTERN.findall(output))
+
+
+class DirtyLocaleTracker:
+    """Tracks which locales changed between serve rebuilds and keeps the pages of the others
+
+    MkDocs re-renders every page on each serve rebuild. Pages of a locale only
+    depend on the locale's own sources, once the set of files (which decides
+    alternates and navigations) and everything shared by all locales are
+    unchanged. The output of such locales is kept from the build that
+    rendered them and written again instead of their rendered pages. The
+    pages stay in the build, so links from other pages still resolve, but
+    are rendered from empty sources.
+    """
+
+    def __init__(self):
+        # Fingerprint of everything shared by all locales at the last build
+        self.shared_fingerprint: Optional[str] = None
+        # Fingerprint of the sources of every locale at the last build
+        self.fingerprints: Dict[str, str] = {}
+        # Destination of the pages of every locale at the last build
+        self.pages: Dict[str, List[str]] = {}
+        # Rendered HTML of the pages of every locale, keyed by dest_uri
+        self.outputs: Dict[str, Dict[str, str]] = {}
+        # Locales whose outputs are complete
+        self.complete: Set[str] = set()
+        # Fingerprints and pages of the build in progress, kept once it succeeds
+        self.pending: Optional[Tuple[str, Dict[str, str], Dict[str, List[str]]]] = None
+
+    def fingerprint_files(
+        self, files: Files, locale_mapper: LocaleMapper, config: MkDocsConfig
+    ) -> Tuple[str, Dict[str, str], Dict[str, List[str]]]:
+        """
+        Fingerprint the sources shared by all locales and those of every locale
+
+        Args:
+            files: MkDocs Files collection, classified by locale
+            locale_mapper: Locale mapper of the build
+            config: MkDocs configuration object
+
+        Returns:
+            Shared fingerprint, the fingerprint of every locale and the
+            destination of its pages, keyed by lang
+        """
+        shared = hashlib.sha1()
+        digests: dict = {}
+        pages: Dict[str, List[str]] = {}
+        for file in files:
+            if file.abs_src_path is not None:
+                signature = _stat_signature(file.abs_src_path)
+            else:
+                signature = hashlib.sha1(file.content_bytes).hexdigest()
+
+            # Every locale's alternates and navigations depend on the file set
+            shared.update(f"{file.src_uri}\n".encode())
+            locale = locale_mapper.get_locale_by_file(file)
+            if locale is None:
+                shared.update(f"{signature}\n".encode())
+            else:
+                digest = digests.setdefault(locale.lang, hashlib.sha1())
+                digest.update(f"{file.src_uri}\0{signature}\n".encode())
+                if file.is_documentation_page():
+                    pages.setdefault(locale.lang, []).append(file.dest_uri)
+
+        # Templates and watched paths, e.g. snippets, may be used by any page
+        paths = [config.config_file_path or "", *config.watch]
+        if config.theme.custom_dir:
+            paths.append(config.theme.custom_dir)
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(names):
+                        full_path = os.path.join(root, name)
+                        shared.update(
+                            f"{full_path}\0{_stat_signature(full_path)}\n".encode()
+                        )
+            else:
+                shared.update(f"{path}\0{_stat_signature(path)}\n".encode())
+
+        fingerprints = {lang: digest.hexdigest() for lang, digest in digests.items()}
+        return shared.hexdigest(), fingerprints, pages
+
+    def get_clean_locales(
+        self,
+        files: Files,
+        locale_mapper: LocaleMapper,
+        locales: List[LocaleConfig],
+        config: MkDocsConfig,
+    ) -> List[LocaleConfig]:
+        """
+        Get the locales whose pages can be reused from a previous build (called in on_files event)
+
+        Args:
+            files: MkDocs Files collection, classified by locale
+            locale_mapper: Locale mapper of the build
+            locales: Locales of the build
+            config: MkDocs configuration object
+
+        Returns:
+            Locales whose sources did not change since their pages were rendered
+        """
+        shared, fingerprints, pages = self.fingerprint_files(
+            files, locale_mapper, config
+        )
+        self.pending = (shared, fingerprints, pages)
+
+        if shared != self.shared_fingerprint:
+            clean_locales = []
+        else:
+            clean_locales = [
+                locale
+                for locale in locales
+                if locale.lang in self.complete
+                and fingerprints.get(locale.lang) == self.fingerprints.get(locale.lang)
+            ]
+
+        # Pages of the other locales are rendered, and their output collected again
+        for locale in locales:
+            if locale not in clean_locales:
+                self.complete.discard(locale.lang)
+                self.outputs[locale.lang] = {}
+
+        return clean_locales
+
+    def reuse_pages(
+        self,
+        files: Files,
+        locale_mapper: LocaleMapper,
+        clean_locales: List[LocaleConfig],
+    ) -> Dict[str, str]:
+        """
+        Get the previous output of the pages of clean locales (called in on_files event)
+
+        The pages are left in files, the plugin renders them from empty sources
+        and writes their previous output instead.
+
+        Args:
+            files: MkDocs Files collection, classified by locale
+            locale_mapper: Locale mapper of the build
+            clean_locales: Locales returned by get_clean_locales
+
+        Returns:
+            Previous output of the reused pages, keyed by dest_uri
+        """
+        reused = {}
+        for file in files.documentation_pages():
+            locale = locale_mapper.get_locale_by_file(file)
+            if locale is None or locale not in clean_locales:
+                continue
+
+            output = self.outputs[locale.lang].get(file.dest_uri)
+            if output is not None:
+                reused[file.dest_uri] = output
+
+        log.info(
+            f"Reused {len(reused)} pages of unchanged locales: "
+            + ", ".join(locale.lang for locale in clean_locales)
+        )
+        return reused
+
+    def store_output(self, lang: str, dest_uri: str, output: str) -> None:
+        """Keep the rendered output of a page (called in on_post_page event)"""
+        if lang in self.outputs:
+            self.outputs[lang][dest_uri] = output
+
+    def commit(self) -> None:
+        """Remember the fingerprints of a build that completed (called in on_post_build event)"""
+        if self.pending is None:
+            return
+
+        self.shared_fingerprint, self.fingerprints, self.pages = self.pending
+        self.complete.update(self.outputs)
+        self.pending = None
+
+    def load_outputs(self, site_dir: str) -> None:
+        """
+        Read the output of the last build from the site directory (called in on_serve event)
+
+        The first build of `mkdocs serve` starts before the site is known to be
+        served, so its output is read back once instead of being kept in memory.
+
+        Args:
+            site_dir: Site directory the last build was written to
+        """
+        for lang, dest_uris in self.pages.items():
+            outputs = {}
+            try:
+                for dest_uri in dest_uris:
+                    with open(os.path.join(site_dir, dest_uri), encoding="utf-8") as f:
+                        outputs[dest_uri] = f.read()
+            except (OSError, ValueError) as e:
+                log.debug(f"Pages of '{lang}' will be rendered again: {e}")
+                self.complete.discard(lang)
+                continue
+
+            self.outputs[lang] = outputs
+            self.complete.add(lang)
@@ -1,11 +1,15 @@
 """Index page generation functionality for MkDocs Material i18n Plugin"""
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import jinja2
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import get_plugin_logger
 
 from .config import LocaleConfig
+from .negotiation import LanguageNegotiator
+from .output import write_file
 
 log = get_plugin_logger(__name__)
 
@@ -18,7 +22,7 @@ DEFAULT_INDEX_TEMPLATE = """<!DOCTYPE html>
     <title>Redirecting ...</title>
 
     <!-- Redirect to {default_locale_lang} after 3s (Which usually happens when JavaScript is disabled) -->
-    <meta http-equiv="refresh" content="3;url={default_locale_link}" />
+    <meta http-equiv="refresh" content="3;url={default_locale_link}" />{prefetch_link}
   </head>
   <body>
     <script>
@@ -27,34 +31,128 @@ DEFAULT_INDEX_TEMPLATE = """<!DOCTYPE html>
 
         const DEFAULT_LANGUAGE = "{default_locale_link}";
 
-        const userLang = (
-          navigator.language ||
-          navigator.userLanguage ||
-          navigator.browserLanguage
-        ).toLowerCase();
-
-        window.location.href =
-          LANGUAGE_MAP[userLang] ||
-          LANGUAGE_MAP[userLang.split("-")[0]] ||
-          DEFAULT_LANGUAGE;
+        const userLangs =
+          navigator.languages && navigator.languages.length
+            ? navigator.languages
+            : [
+                navigator.language ||
+                  navigator.userLanguage ||
+                  navigator.browserLanguage ||
+                  "",
+              ];
+
+        // Language the reader picked in the language switcher, if remembered
+        function rememberedLang() {{
+          {remembered_lang}
+        }}
+
+        // Walk preferred languages, dropping subtags until one matches
+        function negotiate() {{
+          const remembered = rememberedLang();
+          for (const userLang of remembered ? [remembered, ...userLangs] : userLangs) {{
+            let tag = userLang.toLowerCase().replace(/_/g, "-");
+            while (tag) {{
+              if (Object.prototype.hasOwnProperty.call(LANGUAGE_MAP, tag)) {{
+                return LANGUAGE_MAP[tag];
+              }}
+              tag = tag.includes("-") ? tag.replace(/(-[a-z0-9])?-[^-]*$/, "") : "";
+            }}
+          }}
+          return DEFAULT_LANGUAGE;
+        }}
+
+        window.location.href = negotiate();
       }})();
     </script>
   </body>
 </html>"""
 
 
+# Cookie and localStorage key of the language picked in the language switcher
+REMEMBER_LANGUAGE_KEY = "i18n_lang"
+
+# Script saving the language picked in Material's language switcher
+REMEMBER_LANGUAGE_SCRIPT_PATH = "assets/javascripts/i18n-language.js"
+
+REMEMBER_LANGUAGE_SCRIPT = """document.addEventListener("click", function (event) {{
+  const link = event.target.closest && event.target.closest(".md-select a[hreflang]");
+  if (link) {{
+    {store}
+  }}
+}});
+"""
+
+# Statements storing and reading the remembered language, by storage,
+# indented where they are formatted into a script
+REMEMBER_LANGUAGE_STORAGE = {
+    "cookie": (
+        f'document.cookie = "{REMEMBER_LANGUAGE_KEY}=" + encodeURIComponent(link.hreflang) + '
+        '"; path=/; max-age=31536000; SameSite=Lax";',
+        f"const match = document.cookie.match(/(?:^|;\\s*){REMEMBER_LANGUAGE_KEY}=([^;]*)/);\n"
+        "return match ? decodeURIComponent(match[1]) : null;",
+    ),
+    "local_storage": (
+        f'try {{ localStorage.setItem("{REMEMBER_LANGUAGE_KEY}", link.hreflang); }} catch (e) {{}}',
+        f'try {{ return localStorage.getItem("{REMEMBER_LANGUAGE_KEY}"); }} catch (e) {{ return null; }}',
+    ),
+}
+
+
 class IndexPageManager:
     """Handles generation of the root index.html page for multi-language sites"""
 
-    def __init__(self, locales: List[LocaleConfig], default_locale: LocaleConfig):
+    def __init__(
+        self,
+        locales: List[LocaleConfig],
+        default_locale: LocaleConfig,
+        remember_language: Optional[str] = None,
+        prefetch: bool = False,
+        template_cache: Optional[Dict[str, Tuple[int, jinja2.Template]]] = None,
+        links: Optional[Dict[str, str]] = None,
+    ):
         """Initialize the index page generator
 
         Args:
             locales: List of configured locales
             default_locale: Default locale configuration
+            remember_language: Storage of the language picked in the language
+                switcher, "cookie" or "local_storage", None to not remember it
+            prefetch: Whether to prefetch the default locale home page
+            template_cache: Compiled custom index templates kept across
+                rebuilds, keyed by path, along with the mtime they were read at
+            links: Link of every locale keyed by lang, if not its configured link
         """
         self.locales = locales
         self.default_locale = default_locale
+        self.remember_language = remember_language
+        self.prefetch = prefetch
+        self.template_cache = {} if template_cache is None else template_cache
+        self.links = links or {}
+
+    def generate_remember_language_script(self) -> Optional[str]:
+        """Generate the script saving the language picked in the language switcher
+
+        Returns:
+            JavaScript source, None if the language is not remembered
+        """
+        if not self.remember_language:
+            return None
+
+        store, _ = REMEMBER_LANGUAGE_STORAGE[self.remember_language]
+        return REMEMBER_LANGUAGE_SCRIPT.format(store=store)
+
+    def build_language_map(self) -> Dict[str, str]:
+        """Build the mapping of language codes to locale links
+
+        Returns:
+            Locale link of every lowercased language tag a visitor may send,
+            including script and region fallbacks and aliases of each locale
+        """
+        return LanguageNegotiator(self.locales, self.links).build_match_table()
+
+    def get_default_link(self) -> str:
+        """Get the link of the default locale, readers are sent to if no language matches"""
+        return self.links.get(self.default_locale.lang, self.default_locale.link)
 
     def generate_language_map(self) -> str:
         """Generate JavaScript language map for the redirect script
@@ -62,19 +160,7 @@ class IndexPageManager:
         Returns:
             Formatted JavaScript object string for language mapping
         """
-
-        # Collect all language mappings
-        language_map = {}
-        for locale in self.locales:
-            lang_code = locale.lang.lower()
-            language_map[lang_code] = locale.link
-
-        # Add missing base language mappings
-        for lang_code, link in list(language_map.items()):
-            if "-" in lang_code:
-                base_lang = lang_code.split("-")[0]
-                if base_lang not in language_map:
-                    language_map[base_lang] = link
+        language_map = self.build_language_map()
 
         # Convert to JavaScript object format
         language_map_items = [
@@ -93,10 +179,24 @@ class IndexPageManager:
         """
         language_map = self.generate_language_map()
 
+        remembered_lang = "return null;"
+        if self.remember_language:
+            _, remembered_lang = REMEMBER_LANGUAGE_STORAGE[self.remember_language]
+            remembered_lang = remembered_lang.replace("\n", "\n          ")
+
+        # Fetch the most likely target while the redirect is being decided
+        prefetch_link = ""
+        if self.prefetch:
+            prefetch_link = (
+                f'\n    <link rel="prefetch" href="{self.get_default_link()}" />'
+            )
+
         return DEFAULT_INDEX_TEMPLATE.format(
             default_locale_lang=self.default_locale.lang,
-            default_locale_link=self.default_locale.link,
+            default_locale_link=self.get_default_link(),
             language_map=language_map,
+            remembered_lang=remembered_lang,
+            prefetch_link=prefetch_link,
         )
 
     def get_custom_index_template(self, config: MkDocsConfig) -> Optional[str]:
@@ -120,6 +220,74 @@ class IndexPageManager:
 
         return None
 
+    def get_compiled_index_template(
+        self, config: MkDocsConfig
+    ) -> Optional[jinja2.Template]:
+        """Get the custom index.html template compiled, reusing it while the file is unchanged
+
+        Args:
+            config: MkDocs configuration object
+
+        Returns:
+            Compiled template if a custom index.html is found, None otherwise
+        """
+        if not config.theme.custom_dir:
+            return None
+
+        custom_index_path = os.path.join(config.theme.custom_dir, "index.html")
+        try:
+            mtime = os.stat(custom_index_path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self.template_cache.get(custom_index_path)
+        if cached and cached[0] == mtime:
+            log.debug("Reusing compiled custom index.html template")
+            return cached[1]
+
+        source = self.get_custom_index_template(config)
+        if not source:
+            return None
+
+        environment = jinja2.Environment(keep_trailing_newline=True)
+        try:
+            template = environment.from_string(source)
+        except jinja2.TemplateSyntaxError as e:
+            log.warning(
+                f"Custom index.html is not a valid template, using it as is: {e}"
+            )
+            template = environment.from_string(
+                "{% raw %}" + source.replace("{% endraw %}", "") + "{% endraw %}"
+            )
+
+        self.template_cache[custom_index_path] = (mtime, template)
+        return template
+
+    def render_custom_index(self, config: MkDocsConfig) -> Optional[str]:
+        """Render the custom index.html template, if any
+
+        The template gets the language map as a JavaScript object
+        (``language_map``) and as a dictionary (``languages``), the
+        ``default_locale`` and the ``locales``.
+
+        Args:
+            config: MkDocs configuration object
+
+        Returns:
+            Rendered HTML if a custom index.html is found, None otherwise
+        """
+        template = self.get_compiled_index_template(config)
+        if template is None:
+            return None
+
+        return template.render(
+            language_map=self.generate_language_map(),
+            languages=self.build_language_map(),
+            default_locale=self.default_locale,
+            locales=self.locales,
+            config=config,
+        )
+
     def create_index_file(self, config: MkDocsConfig) -> bool:
         """Create the index.html file in the site directory
 
@@ -130,7 +298,7 @@ class IndexPageManager:
             True if file was created successfully, False otherwise
         """
         # Check for custom template first
-        custom_template = self.get_custom_index_template(config)
+        custom_template = self.render_custom_index(config)
 
         if custom_template:
             html_content = custom_template
@@ -147,9 +315,8 @@ class IndexPageManager:
         # Write index.html to site directory
         index_path = os.path.join(config.site_dir, "index.html")
         try:
-            with open(index_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-            log.debug(f"Created index.html at {index_path}")
+            if write_file(index_path, html_content):
+                log.debug(f"Created index.html at {index_path}")
             return True
         except Exception as e:
             log.error(f"Failed to create index.html: {e}")
@@ -1,26 +1,126 @@
 """Language detection and context management for MkDocs Material i18n Plugin"""
 
+from typing import Dict, Optional, Tuple
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import get_plugin_logger
 
-from .locale_mapper import get_locale_mapper
+from .config import LocaleConfig
+from .config_view import ConfigView
+from .locale_mapper import LocaleMapper
 
 log = get_plugin_logger(__name__)
 
 
+def group_translations(
+    counterparts: Dict[Tuple[str, str], str],
+) -> Dict[str, Dict[str, str]]:
+    """
+    Group the translations of every page
+
+    Args:
+        counterparts: Page URL of every translation, keyed by
+            (path below locale link, lang), see LanguageManager
+
+    Returns:
+        Page URL of every lang, keyed by path below locale link, in file order
+    """
+    translations: Dict[str, Dict[str, str]] = {}
+    for (relative_url, lang), url in counterparts.items():
+        translations.setdefault(relative_url, {})[lang] = url
+    return translations
+
+
 class LanguageManager:
     """Manages language detection and context modification for pages"""
 
-    def __init__(self, locales):
+    def __init__(
+        self,
+        locales,
+        locale_mapper: LocaleMapper,
+        default_locale: Optional[LocaleConfig] = None,
+        alternate_fallback: str = "home",
+        production_urls: Optional[Dict[str, str]] = None,
+    ):
         """
         Initialize the language context manager
 
         Args:
             locales: List of locale configurations from plugin config
+            locale_mapper: Locale mapper of the plugin instance
+            default_locale: Default locale configuration
+            alternate_fallback: Target of alternate links to missing translations,
+                "home" for the locale home page or "default" for the default-locale page
+            production_urls: Site URL of every locale that is not built, keyed
+                by lang, alternate links to its pages point at the production site
         """
         self.locales = locales
-        self.locale_mapper = get_locale_mapper()
+        self.default_locale = default_locale
+        self.alternate_fallback = alternate_fallback
+        self.production_urls = production_urls or {}
+        # Page URL of every translation, keyed by (path below locale link, lang)
+        self.counterparts: Dict[Tuple[str, str], str] = {}
+        # Read-through config of every page's template context, keyed by src_uri
+        self.page_configs: Dict[str, ConfigView] = {}
+        self.locale_mapper = locale_mapper
+
+    def get_relative_url(self, file: File, locale: LocaleConfig) -> str:
+        """
+        Get the URL of a file relative to its locale link
+
+        Args:
+            file: MkDocs File instance
+            locale: Locale configuration of the file
+
+        Returns:
+            URL below the locale link, e.g. "guide/" for "en/guide/"
+        """
+        url = "" if file.url == "./" else file.url
+        url_dir = self.locale_mapper.get_url_dir(locale)
+        if not url_dir:
+            return url
+
+        link_prefix = url_dir + "/"
+        if url.startswith(link_prefix):
+            return url[len(link_prefix) :]
+        return ""
+
+    def build_counterpart_index(self, files: Files) -> None:
+        """
+        Index the URL of every translated page once per build (called in on_files event)
+
+        Args:
+            files: MkDocs Files collection
+        """
+        self.counterparts = {}
+        for file in files.documentation_pages():
+            locale = self.locale_mapper.get_locale_by_file(file)
+            if locale:
+                relative_url = self.get_relative_url(file, locale)
+                self.counterparts[(relative_url, locale.lang)] = (
+                    "/" if file.url == "./" else "/" + file.url
+                )
+        log.debug(f"Indexed {len(self.counterparts)} translated pages")
+
+    def get_alternate_link(self, relative_url: str, locale: LocaleConfig) -> str:
+        """
+        Get the link to the translation of a page, falling back if it is missing
+
+        Args:
+            relative_url: URL of the page below its locale link
+            locale: Locale configuration of the translation
+
+        Returns:
+            Absolute link to the translation or to the fallback target
+        """
+        link = self.counterparts.get((relative_url, locale.lang))
+        if link is None and self.alternate_fallback == "default":
+            default_lang = self.default_locale.lang if self.default_locale else None
+            link = self.counterparts.get((relative_url, default_lang))
+        if link is None:
+            link = self.locale_mapper.get_url(locale)
+        return self.production_urls.get(locale.lang, "") + link
 
     def detect_page_language(self, page: Page) -> str:
         """
@@ -33,7 +133,53 @@ class LanguageManager:
             Language code string or None if not detected
         """
 
-        return self.locale_mapper.detect_lang_from_path(page.file.src_path)
+        return self.locale_mapper.get_lang_by_page(page)
+
+    def build_page_configs(self, files: Files, config: MkDocsConfig) -> None:
+        """
+        Precompute the language, site name and alternates of every page (called in on_nav event)
+
+        Alternates only depend on a page's URL below its locale link, so pages
+        sharing that URL across locales share one alternate list.
+
+        Args:
+            files: MkDocs Files collection
+            config: MkDocs configuration object
+        """
+        theme_views = {
+            locale.lang: ConfigView(config.theme, language=locale.lang)
+            for locale in self.locales
+        }
+        extra_views: Dict[str, ConfigView] = {}
+
+        self.page_configs = {}
+        for file in files.documentation_pages():
+            locale = self.locale_mapper.get_locale_by_file(file)
+            if not locale:
+                continue
+
+            relative_url = self.get_relative_url(file, locale)
+            extra_view = extra_views.get(relative_url)
+            if extra_view is None:
+                alternates = [
+                    {
+                        "name": alt_locale.name,
+                        "link": self.get_alternate_link(relative_url, alt_locale),
+                        "lang": alt_locale.lang,
+                    }
+                    for alt_locale in self.locales
+                ]
+                extra_view = extra_views[relative_url] = ConfigView(
+                    config.extra, alternate=alternates
+                )
+
+            overrides = {"theme": theme_views[locale.lang], "extra": extra_view}
+            # Set the localized site_name if configured
+            if locale.site_name:
+                overrides["site_name"] = locale.site_name
+            self.page_configs[file.src_uri] = ConfigView(config, **overrides)
+
+        log.debug(f"Precomputed language context for {len(self.page_configs)} pages")
 
     def modify_page_context(
         self, context: dict, page: Page, config: MkDocsConfig
@@ -41,6 +187,10 @@ class LanguageManager:
         """
         Modify the page context to set the correct language for the current page
 
+        The page's template context gets a read-through view of the config with
+        its theme language, site name and alternates, the shared config is not
+        modified.
+
         Args:
             context: Template context dictionary
             page: MkDocs Page instance
@@ -50,29 +200,12 @@ class LanguageManager:
             Modified context dictionary
         """
 
-        # Get the current page's locale configuration directly
-        current_locale = self.locale_mapper.detect_locale_from_path(page.file.src_path)
-        if current_locale:
-            # Directly modify the config theme language for this page
-            config.theme.language = current_locale.lang
-
-            # Set the localized site_name if configured
-            if current_locale.site_name:
-                config.site_name = current_locale.site_name
-                log.debug(
-                    f"Set site_name to '{current_locale.site_name}' for language '{current_locale.lang}'"
-                )
-
-            current_url = page.url
-            url_parts = current_url.strip("/").split("/")
-            if len(url_parts) > 1:
-                path_without_lang = "/".join(url_parts[1:]) + "/"
-            else:
-                path_without_lang = ""
-            for alt in config.extra["alternate"]:
-                alt["link"] = "/" + alt["link"].split("/")[1] + "/" + path_without_lang
-                log.debug(
-                    f"Set language '{current_locale.lang}' for page: {page.file.src_path}"
-                )
+        page_config = self.page_configs.get(page.file.src_uri)
+        if page_config is not None:
+            context["config"] = page_config
+            log.debug(
+                f"Set language '{page_config.theme['language']}' "
+                f"for page: {page.file.src_path}"
+            )
 
         return context
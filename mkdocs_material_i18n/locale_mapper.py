@@ -1,59 +1,74 @@
-"""Locale mapping singleton for MkDocs Material i18n Plugin"""
+"""Locale mapping for MkDocs Material i18n Plugin"""
 
-from typing import Dict, List, Optional
-from pathlib import Path
+import os
+from typing import Any, Dict, List, Optional
 from mkdocs.plugins import get_plugin_logger
 
 from .config import LocaleConfig
 
 log = get_plugin_logger(__name__)
 
+# Key under which a trie node stores the locale whose link ends at that node
+_LOCALE_KEY = None
+
 
 class LocaleMapper:
     """
-    Singleton class for managing locale mappings from link directories to locale configurations.
+    Class for managing locale mappings from link directories to locale configurations.
 
-    This class provides a centralized way to map link directories (first level directories in paths)
+    This class provides a centralized way to map link directories (the leading directories in paths)
     to their corresponding locale configurations, eliminating the need for duplicate link_to_lang
     mappings across multiple classes.
-    """
 
-    _instance = None
-    _initialized = False
+    Each plugin instance owns its mapper and hands it to its managers, so several
+    sites can be built in one process, also concurrently, without sharing state.
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(LocaleMapper, cls).__new__(cls)
-        return cls._instance
+    Links are stored in a segment trie so that multi-segment links such as ``/docs/en/`` work and
+    the longest matching prefix wins. Path lookups are memoized per ``src_path``.
+    """
 
     def __init__(self):
-        # Prevent re-initialization
-        if LocaleMapper._initialized:
-            return
-
         self.link2locale: Dict[str, LocaleConfig] = {}
         self._locales: List[LocaleConfig] = []
-        LocaleMapper._initialized = True
-        log.debug("LocaleMapper singleton initialized")
-
-    def initialize(self, locales: List[LocaleConfig]) -> None:
+        self._trie: Dict[Any, Any] = {}
+        self._path_cache: Dict[str, Optional[LocaleConfig]] = {}
+        self.file2locale: Dict[str, Optional[LocaleConfig]] = {}
+        self.root_locale: Optional[LocaleConfig] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def initialize(
+        self, locales: List[LocaleConfig], root_locale: Optional[LocaleConfig] = None
+    ) -> None:
         """
         Initialize the mapper with locale configurations.
 
         Args:
             locales: List of locale configurations
+            root_locale: Locale whose pages are built at the site root instead
+                of below its link, if any
         """
         self._locales = locales
+        self.root_locale = root_locale
         self.link2locale.clear()
+        self._trie = {}
+        self._clear_path_cache()
+        self.file2locale.clear()
 
         for locale in locales:
-            # Extract the first level directory from link
-            link_dir = locale.link.strip("/").split("/")[0]
-            if link_dir:  # Only add non-empty directories
-                self.link2locale[link_dir] = locale
-                log.debug(
-                    f"Mapped link directory '{link_dir}' to locale '{locale.lang}'"
-                )
+            # Extract the link directory segments from link
+            segments = [segment for segment in locale.link.split("/") if segment]
+            if not segments:  # Only add non-empty directories
+                continue
+
+            link_dir = "/".join(segments)
+            self.link2locale[link_dir] = locale
+
+            node = self._trie
+            for segment in segments:
+                node = node.setdefault(segment, {})
+            node[_LOCALE_KEY] = locale
+            log.debug(f"Mapped link directory '{link_dir}' to locale '{locale.lang}'")
 
         log.info(
             f"LocaleMapper initialized with {len(self.link2locale)} locale mappings"
@@ -64,7 +79,7 @@ class LocaleMapper:
         Get locale configuration by link directory.
 
         Args:
-            link_dir: First level directory from a link path
+            link_dir: Link directory without surrounding slashes, e.g. "en" or "docs/en"
 
         Returns:
             LocaleConfig instance or None if not found
@@ -76,7 +91,7 @@ class LocaleMapper:
         Get language code by link directory.
 
         Args:
-            link_dir: First level directory from a link path
+            link_dir: Link directory without surrounding slashes, e.g. "en" or "docs/en"
 
         Returns:
             Language code string or None if not found
@@ -94,8 +109,164 @@ class LocaleMapper:
         Returns:
             LocaleConfig instance or None if not detected
         """
-        first_dir = Path(src_path).parts[0] if Path(src_path).parts else None
-        return self.get_locale_by_link_dir(first_dir) if first_dir else None
+        try:
+            locale = self._path_cache[src_path]
+        except KeyError:
+            self.cache_misses += 1
+            locale = self._path_cache[src_path] = self._resolve(src_path)
+        else:
+            self.cache_hits += 1
+        return locale
+
+    def _resolve(self, src_path: str) -> Optional[LocaleConfig]:
+        """
+        Walk the link trie along the directories of a path and return the longest match.
+
+        Args:
+            src_path: Source file path
+
+        Returns:
+            LocaleConfig instance or None if no link prefixes the path
+        """
+        if os.sep != "/":
+            src_path = src_path.replace(os.sep, "/")
+
+        # The last segment is the file name, only directories can match a link
+        node = self._trie
+        match = None
+        for segment in src_path.split("/")[:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            match = node.get(_LOCALE_KEY, match)
+        return match
+
+    def _clear_path_cache(self) -> None:
+        """Drop memoized path lookups and reset the hit/miss counters."""
+        self._path_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get statistics about the path lookup cache.
+
+        Returns:
+            Dictionary with hits, misses and the number of cached paths
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._path_cache),
+        }
+
+    def get_url_dir(self, locale: LocaleConfig) -> str:
+        """
+        Get the directory the pages of a locale are built to.
+
+        Args:
+            locale: Locale configuration
+
+        Returns:
+            Link directory, e.g. "en", or "" for the root locale
+        """
+        if locale is self.root_locale:
+            return ""
+        return locale.link.strip("/")
+
+    def get_url(self, locale: LocaleConfig) -> str:
+        """
+        Get the absolute URL of the home page of a locale.
+
+        Args:
+            locale: Locale configuration
+
+        Returns:
+            URL such as "/en/", or "/" for the root locale
+        """
+        url_dir = self.get_url_dir(locale)
+        return f"/{url_dir}/" if url_dir else "/"
+
+    def detect_locale_from_url(self, url: str) -> Optional[LocaleConfig]:
+        """
+        Detect locale from the URL of a built page.
+
+        Unlike source paths, pages of the root locale have no link prefix, so
+        URLs outside of every other locale belong to the root locale.
+
+        Args:
+            url: Page URL relative to the site root, e.g. "zh/guide/"
+
+        Returns:
+            LocaleConfig instance or None if not detected
+        """
+        locale = self.detect_locale_from_path(url.lstrip("/"))
+        if locale is None or locale is self.root_locale:
+            return self.root_locale
+        return locale
+
+    def move_root_locale_files(self, files) -> int:
+        """
+        Build the files of the root locale at the site root instead of below its link.
+
+        Files outside of every locale whose destination is taken by a file of
+        the root locale are removed, with a warning.
+
+        Args:
+            files: MkDocs Files collection, classified by classify_files
+
+        Returns:
+            Number of moved files
+        """
+        if self.root_locale is None:
+            return 0
+
+        prefix = self.root_locale.link.strip("/") + "/"
+        moved = {}
+        for file in files:
+            if self.get_locale_by_file(file) is self.root_locale:
+                if file.dest_uri.startswith(prefix):
+                    file.dest_uri = file.dest_uri[len(prefix) :]
+                    # Drop properties derived from the previous destination
+                    file.__dict__.pop("url", None)
+                    file.__dict__.pop("abs_dest_path", None)
+                    moved[file.dest_uri] = file
+
+        for file in list(files):
+            if file.dest_uri in moved and moved[file.dest_uri] is not file:
+                log.warning(
+                    f"'{file.src_uri}' is replaced by '{moved[file.dest_uri].src_uri}' "
+                    f"of the default locale built at the site root"
+                )
+                files.remove(file)
+
+        log.debug(
+            f"Moved {len(moved)} files of '{self.root_locale.lang}' to the site root"
+        )
+        return len(moved)
+
+    def remove_locale_files(self, files, locales: List[LocaleConfig]) -> int:
+        """
+        Remove the files of locales that are not built.
+
+        Files outside of every locale, e.g. shared assets, are kept.
+
+        Args:
+            files: MkDocs Files collection, classified by classify_files
+            locales: Locales whose files are kept
+
+        Returns:
+            Number of removed files
+        """
+        removed = 0
+        for file in list(files):
+            locale = self.get_locale_by_file(file)
+            if locale is not None and locale not in locales:
+                files.remove(file)
+                removed += 1
+
+        log.debug(f"Removed {removed} files of locales that are not built")
+        return removed
 
     def detect_lang_from_path(self, src_path: str) -> Optional[str]:
         """
@@ -110,6 +281,21 @@ class LocaleMapper:
         locale = self.detect_locale_from_path(src_path)
         return locale.lang if locale else None
 
+    def get_locale_by_lang(self, lang: str) -> Optional[LocaleConfig]:
+        """
+        Get locale configuration by language code.
+
+        Args:
+            lang: Language code
+
+        Returns:
+            LocaleConfig instance or None if not found
+        """
+        for locale in self._locales:
+            if locale.lang == lang:
+                return locale
+        return None
+
     def get_all_locales(self) -> List[LocaleConfig]:
         """
         Get all locale configurations.
@@ -143,8 +329,42 @@ class LocaleMapper:
         """
         self.link2locale.clear()
         self._locales.clear()
+        self._trie = {}
+        self._clear_path_cache()
+        self.file2locale.clear()
+        self.root_locale = None
         log.debug("LocaleMapper reset")
 
+    def classify_files(self, files) -> None:
+        """
+        Resolve the locale of every file once and remember it by source URI.
+
+        Args:
+            files: MkDocs Files collection
+        """
+        self.file2locale = {
+            file.src_uri: self.detect_locale_from_path(file.src_uri) for file in files
+        }
+        log.debug(f"Classified {len(self.file2locale)} files by locale")
+
+    def get_locale_by_file(self, file) -> Optional[LocaleConfig]:
+        """
+        Get locale configuration by MkDocs file.
+
+        Files classified in on_files are a single dictionary read, files added
+        later (e.g. by other plugins) fall back to path detection.
+
+        Args:
+            file: MkDocs File instance
+
+        Returns:
+            LocaleConfig instance or None if not found
+        """
+        try:
+            return self.file2locale[file.src_uri]
+        except KeyError:
+            return self.detect_locale_from_path(file.src_uri)
+
     def get_locale_by_page(self, page) -> Optional[LocaleConfig]:
         """
         Get locale configuration by MkDocs page.
@@ -155,7 +375,7 @@ class LocaleMapper:
         Returns:
             LocaleConfig instance or None if not found
         """
-        return self.detect_locale_from_path(page.file.src_path)
+        return self.get_locale_by_file(page.file)
 
     def get_lang_by_page(self, page) -> Optional[str]:
         """
@@ -181,13 +401,3 @@ class LocaleMapper:
             True if a locale is found, False otherwise"""
         return self.detect_locale_from_path(src_path) is not None
 
-
-# Convenience function to get the singleton instance
-def get_locale_mapper() -> LocaleMapper:
-    """
-    Get the LocaleMapper singleton instance.
-
-    Returns:
-        LocaleMapper singleton instance
-    """
-    return LocaleMapper()
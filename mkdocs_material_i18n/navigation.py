@@ -1,37 +1,75 @@
 """Navigation management for MkDocs Material i18n Plugin"""
 
-from typing import Dict, List, Optional
-from mkdocs.structure.nav import Navigation, get_navigation
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+from mkdocs.structure.nav import Link, Navigation, Section, get_navigation
 from mkdocs.structure.files import Files
 from mkdocs.structure.pages import Page
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import get_plugin_logger
 
+from .cache import BuildCache
 from .config import LocaleConfig
-from .locale_mapper import get_locale_mapper
+from .config_view import ConfigView
+from .locale_mapper import LocaleMapper
 
 log = get_plugin_logger(__name__)
 
 
+def _link_previous_and_next(pages: List[Page]) -> None:
+    """Chain the previous and next links of pages in navigation order"""
+    bookended = [None, *pages, None]
+    for previous_page, page, next_page in zip(bookended, pages, bookended[2:]):
+        page.previous_page, page.next_page = previous_page, next_page
+
+
 class NavigationManager:
     """Manages language-specific navigation structures"""
 
-    def __init__(self, locales: List[LocaleConfig]):
+    def __init__(
+        self,
+        locales: List[LocaleConfig],
+        locale_mapper: LocaleMapper,
+        nav_cache: Optional[Dict[str, Tuple[str, Navigation]]] = None,
+        derive_nav: bool = False,
+        build_cache: Optional[BuildCache] = None,
+        lazy: bool = False,
+    ):
+        """
+        Initialize the navigation manager
+
+        Args:
+            locales: List of locale configurations from plugin config
+            locale_mapper: Locale mapper of the plugin instance
+            nav_cache: Fingerprinted navigations kept across rebuilds, keyed by lang
+            derive_nav: Derive navigations without a custom nav from the global navigation
+            build_cache: On-disk cache the navigations are also kept in across builds
+            lazy: Build the navigation of a language when its first page is rendered
+        """
         self.locales = locales
         self.language_navs: Dict[str, Navigation] = {}
         self.language_files: Dict[str, Files] = {}
-        self.locale_mapper = get_locale_mapper()
+        self.nav_cache = nav_cache if nav_cache is not None else {}
+        self.derive_nav = derive_nav
+        self.build_cache = build_cache
+        self.lazy = lazy
+        self.locale_mapper = locale_mapper
+        # Global navigation, files and config lazy navigations are built from
+        self.nav_sources: Optional[Tuple[Navigation, Files, MkDocsConfig]] = None
 
     def build_language_files(self, files: Files) -> None:
         """Build language-specific file collections (called in on_files event)"""
 
+        self.language_files = {}
+
         # Pre-filter files by language for better performance
         language_file_lists = {locale.lang: [] for locale in self.locales}
         for file in files:
-            file_lang = self.locale_mapper.detect_lang_from_path(file.src_path)
+            file_locale = self.locale_mapper.get_locale_by_file(file)
 
-            if file_lang and file_lang in language_file_lists:
-                language_file_lists[file_lang].append(file)
+            if file_locale and file_locale.lang in language_file_lists:
+                language_file_lists[file_locale.lang].append(file)
 
         # Create Files objects for each language
         for lang, file_list in language_file_lists.items():
@@ -43,19 +81,241 @@ class NavigationManager:
     def build_language_navigations(
         self, nav: Navigation, files: Files, config: MkDocsConfig
     ) -> None:
-        """Build navigation structures for each language"""
+        """Build navigation structures for each language, or prepare to when lazy"""
 
         # If language files haven't been built yet, build them now
         if not self.language_files:
             self.build_language_files(files)
 
-        # Create language-specific navigations using pre-built file collections
-        for locale in self.locales:
+        self.language_navs = {}
+        if self.lazy:
+            self.nav_sources = (nav, files, config)
+            log.debug("Deferred language navigations to their first page")
+            return
+
+        self._load_navigations(self.locales, nav, files, config)
+
+    def get_language_nav(self, lang: str) -> Optional[Navigation]:
+        """
+        Get the navigation of a language, building it first if lazy
+
+        Args:
+            lang: Language code
+
+        Returns:
+            Navigation of the language, None if it has no files
+        """
+        if lang in self.language_navs:
+            return self.language_navs[lang]
+
+        locale = next((locale for locale in self.locales if locale.lang == lang), None)
+        if locale is None or self.nav_sources is None:
+            return None
+        return self._load_navigations([locale], *self.nav_sources).get(lang)
+
+    def _load_navigations(
+        self,
+        locales: List[LocaleConfig],
+        nav: Navigation,
+        files: Files,
+        config: MkDocsConfig,
+    ) -> Dict[str, Navigation]:
+        """Derive, reuse, restore or build the navigations of several languages"""
+
+        # Create language-specific navigations using pre-built file collections,
+        # reusing the previous build's navigation if its inputs did not change
+        fingerprints: Dict[str, str] = {}
+        built_navs: Dict[str, Navigation] = {}
+        stale_locales: List[LocaleConfig] = []
+        for locale in locales:
             lang = locale.lang
-            if lang in self.language_files:
-                language_nav = self._build_navigation_for_language(config, locale)
-                self.language_navs[lang] = language_nav
-                log.debug(f"Built navigation for language: {lang}")
+            if lang in self.language_files and self.derive_nav and not locale.nav:
+                # Deriving is as cheap as rebinding a cached navigation
+                built_navs[lang] = self._derive_navigation_for_language(
+                    nav, config, locale
+                )
+                log.debug(f"Derived navigation for language: {lang}")
+            elif lang in self.language_files:
+                fingerprint = fingerprints[lang] = self._fingerprint_language(
+                    locale, config
+                )
+                cached = self.nav_cache.get(lang)
+                if cached and cached[0] == fingerprint:
+                    built_navs[lang] = self._rebind_navigation(cached[1], files)
+                    log.debug(f"Reused navigation for language: {lang}")
+                else:
+                    stale_locales.append(locale)
+
+        # Look up navigations missing in memory on disk, e.g. on cold builds
+        cache_keys: Dict[str, str] = {}
+        if self.build_cache is not None:
+            missing_locales, stale_locales = stale_locales, []
+            for locale in missing_locales:
+                lang = locale.lang
+                key = cache_keys[lang] = BuildCache.make_key("nav", fingerprints[lang])
+                data = self.build_cache.get(key)
+                language_nav = (
+                    self._restore_navigation(data, files) if data is not None else None
+                )
+                if language_nav is not None:
+                    built_navs[lang] = language_nav
+                    log.debug(f"Restored cached navigation for language: {lang}")
+                else:
+                    stale_locales.append(locale)
+
+        for locale in stale_locales:
+            lang = locale.lang
+            language_nav = built_navs[lang] = self._build_navigation_for_language(
+                config, locale
+            )
+            log.debug(f"Built navigation for language: {lang}")
+            if lang in cache_keys:
+                self.build_cache.set(
+                    cache_keys[lang], self._serialize_navigation(language_nav.items)
+                )
+
+        # Keep navigations in locale order
+        for locale in locales:
+            lang = locale.lang
+            if lang in built_navs:
+                if lang in fingerprints:
+                    self.nav_cache[lang] = (fingerprints[lang], built_navs[lang])
+                self.language_navs[lang] = built_navs[lang]
+        return built_navs
+
+    def _derive_navigation_for_language(
+        self, nav: Navigation, config: MkDocsConfig, locale: LocaleConfig
+    ) -> Navigation:
+        """Derive a language navigation by filtering and re-rooting the global navigation
+
+        The global navigation already holds the Page objects MkDocs renders, so
+        the derived navigation shares them instead of building a new tree. Only
+        sections are recreated; links cannot be attributed to a language and are
+        dropped. An auto-generated global navigation nests each language below
+        one section per link segment, those sections are removed again.
+        """
+        pages: List[Page] = []
+
+        def keep(items: list) -> list:
+            kept = []
+            for item in items:
+                if isinstance(item, Page):
+                    if self.locale_mapper.get_locale_by_page(item) is locale:
+                        kept.append(item)
+                elif isinstance(item, Section):
+                    children = keep(item.children)
+                    if children:
+                        kept.append(Section(item.title, children))
+            return kept
+
+        items = keep(nav.items)
+        if config["nav"] is None:
+            for _ in locale.link.strip("/").split("/"):
+                if len(items) == 1 and isinstance(items[0], Section):
+                    items = items[0].children
+
+        def link(items: list, parent: Optional[Section]) -> None:
+            for item in items:
+                item.parent = parent
+                if isinstance(item, Section):
+                    link(item.children, item)
+                else:
+                    pages.append(item)
+
+        link(items, None)
+
+        # Keep previous and next links within the language
+        _link_previous_and_next(pages)
+
+        return Navigation(items, pages)
+
+    def _fingerprint_language(self, locale: LocaleConfig, config: MkDocsConfig) -> str:
+        """Fingerprint everything a language navigation is derived from
+
+        The navigation only depends on the language's file set (and whether each
+        file is in the nav), the locale's nav configuration and the URL style.
+        """
+        digest = hashlib.sha1()
+        digest.update(json.dumps(locale.nav, sort_keys=True, default=str).encode())
+        digest.update(str(config.use_directory_urls).encode())
+        for file in self.language_files.get(locale.lang, ()):
+            digest.update(f"{file.src_uri}\0{file.inclusion.name}\n".encode())
+        return digest.hexdigest()
+
+    def _rebind_navigation(self, nav: Navigation, files: Files) -> Navigation:
+        """Point a navigation from a previous build at this build's Page objects"""
+        pages: List[Page] = []
+
+        def rebind(items: list, parent: Optional[Section]) -> None:
+            for index, item in enumerate(items):
+                if isinstance(item, Page):
+                    item = items[index] = files.get_file_from_path(
+                        item.file.src_uri
+                    ).page
+                    pages.append(item)
+                if parent is not None:
+                    item.parent = parent
+                if isinstance(item, Section):
+                    item.active = False
+                    rebind(item.children, item)
+
+        rebind(nav.items, None)
+
+        # Include next and previous links, as get_navigation does
+        _link_previous_and_next(pages)
+
+        return Navigation(nav.items, pages)
+
+    def _serialize_navigation(self, items: list) -> list:
+        """Convert navigation items to JSON data, pages are stored by source URI"""
+        data = []
+        for item in items:
+            if isinstance(item, Page):
+                data.append(["page", item.file.src_uri])
+            elif isinstance(item, Section):
+                data.append(
+                    ["section", item.title, self._serialize_navigation(item.children)]
+                )
+            elif isinstance(item, Link):
+                data.append(["link", item.title, item.url])
+        return data
+
+    def _restore_navigation(self, data: list, files: Files) -> Optional[Navigation]:
+        """Rebuild a navigation from JSON data using this build's Page objects
+
+        Returns None if a page of the data is no longer part of the build.
+        """
+        pages: List[Page] = []
+
+        def restore(data: list, parent: Optional[Section]) -> Optional[list]:
+            items = []
+            for kind, *values in data:
+                if kind == "page":
+                    file = files.get_file_from_path(values[0])
+                    if file is None or file.page is None:
+                        return None
+                    item = file.page
+                    pages.append(item)
+                elif kind == "section":
+                    item = Section(values[0], [])
+                    children = restore(values[1], item)
+                    if children is None:
+                        return None
+                    item.children = children
+                else:
+                    item = Link(values[0], values[1])
+                item.parent = parent
+                items.append(item)
+            return items
+
+        items = restore(data, None)
+        if items is None:
+            return None
+
+        # Include next and previous links, as get_navigation does
+        _link_previous_and_next(pages)
+
+        return Navigation(items, pages)
 
     def _build_navigation_for_language(
         self, config: MkDocsConfig, locale: LocaleConfig
@@ -69,29 +329,31 @@ class NavigationManager:
             log.warning(f"No files found for language: {lang}")
             return Navigation([], [])
 
-        # Create a temporary config for this language
-        temp_config = config.copy()
+        # Create a view of the config for this language, only nav differs. If
+        # locale has no custom nav configuration, MkDocs auto-generates the nav
+        # from filtered files
+        language_config = ConfigView(config, nav=locale.nav or None)
 
-        # If locale has custom nav configuration, use it
-        if locale.nav:
-            temp_config["nav"] = locale.nav
-        else:
-            # Let MkDocs auto-generate nav from filtered files
-            temp_config["nav"] = None
         # Build navigation using MkDocs core function
-        return get_navigation(language_files, temp_config)
+        return get_navigation(language_files, language_config)
 
     def detect_page_language(self, page: Page) -> Optional[str]:
         """Detect the language of a page"""
-        return self.locale_mapper.detect_lang_from_path(page.file.src_path)
+        return self.locale_mapper.get_lang_by_page(page)
 
     def modify_navigation_context(self, context: dict, page: Page) -> dict:
         """Modify the navigation context for a page"""
         page_lang = self.detect_page_language(page)
+        language_nav = self.get_language_nav(page_lang) if page_lang else None
+
+        if language_nav is not None:
+            # MkDocs activated the page before a lazy navigation set its
+            # ancestors, activate them as well
+            if page.active:
+                page.active = True
 
-        if page_lang and page_lang in self.language_navs:
             # Replace the navigation with language-specific navigation
-            context["nav"] = self.language_navs[page_lang]
+            context["nav"] = language_nav
             log.debug(
                 f"Set navigation for page {page.file.src_path} to language: {page_lang}"
             )
@@ -0,0 +1,199 @@
+"""BCP-47 language negotiation for MkDocs Material i18n Plugin"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .config import LocaleConfig
+
+# Language subtags that name the same language, preferred code first
+LANGUAGE_ALIASES = [
+    ("he", "iw"),
+    ("id", "in"),
+    ("yi", "ji"),
+    ("jv", "jw"),
+    ("ro", "mo"),
+    ("nb", "no"),
+    ("fil", "tl"),
+]
+
+# Script implied by the region of a language, "" for the language alone
+LIKELY_SCRIPTS = {
+    "zh": {
+        "cn": "hans",
+        "sg": "hans",
+        "my": "hans",
+        "tw": "hant",
+        "hk": "hant",
+        "mo": "hant",
+    },
+    "sr": {"rs": "cyrl", "ba": "cyrl", "me": "latn"},
+}
+
+_ALIAS_GROUPS = {code: group for group in LANGUAGE_ALIASES for code in group}
+
+# Last subtag of a tag, along with a singleton before it (RFC 4647 lookup)
+_LAST_SUBTAG = re.compile(r"(-[a-z0-9])?-[^-]*$")
+
+
+def parse_tag(tag: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Parse the language, script and region subtags of a language tag
+
+    Args:
+        tag: Language tag, e.g. "zh-Hant-TW" or "en_US"
+
+    Returns:
+        Lowercased (language, script, region), missing subtags are None
+    """
+    subtags = tag.lower().replace("_", "-").split("-")
+    language, script, region = subtags[0], None, None
+    for subtag in subtags[1:3]:
+        if script is None and region is None and len(subtag) == 4 and subtag.isalpha():
+            script = subtag
+        elif region is None and (
+            (len(subtag) == 2 and subtag.isalpha())
+            or (len(subtag) == 3 and subtag.isdigit())
+        ):
+            region = subtag
+        else:
+            break
+    return language, script, region
+
+
+def truncate_tag(tag: str) -> str:
+    """Remove the last subtag of a lowercased tag, e.g. "zh-hant-tw" to "zh-hant" """
+    return _LAST_SUBTAG.sub("", tag) if "-" in tag else ""
+
+
+def _join(*subtags: Optional[str]) -> str:
+    return "-".join(subtag for subtag in subtags if subtag)
+
+
+class LanguageNegotiator:
+    """Precomputes which locale every language tag a visitor may send resolves to"""
+
+    def __init__(
+        self, locales: List[LocaleConfig], links: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the language negotiator
+
+        Args:
+            locales: List of locale configurations from plugin config
+            links: Link of every locale keyed by lang, if not its configured link
+        """
+        self.locales = locales
+        self.links = links or {}
+
+    def expand_tag(self, tag: str) -> List[List[str]]:
+        """
+        Expand a configured language tag into the tags it matches, by rank
+
+        Rank 0 holds forms equivalent to the tag, e.g. "zh-tw" and
+        "zh-hant-tw". Rank 1 holds its script and the regions implying that
+        script, e.g. "zh-hant" and "zh-hk". Rank 2 holds the bare language.
+        Every form is repeated for the aliases of the language, e.g. "iw"
+        for "he".
+
+        Args:
+            tag: Language tag of a locale
+
+        Returns:
+            Lowercased tags of every rank
+        """
+        language, script, region = parse_tag(tag)
+        likely_scripts = LIKELY_SCRIPTS.get(language, {})
+        if script is None and region:
+            script = likely_scripts.get(region)
+
+        ranks: List[List[str]] = [[tag.lower().replace("_", "-")], [], [language]]
+        if region:
+            ranks[0].append(_join(language, script, region))
+            if script == likely_scripts.get(region):
+                ranks[0].append(_join(language, region))
+        if script:
+            ranks[1].append(_join(language, script))
+            for other_region, other_script in likely_scripts.items():
+                if other_script == script and other_region != region:
+                    ranks[1].append(_join(language, other_region))
+                    ranks[1].append(_join(language, script, other_region))
+
+        aliases = [code for code in _ALIAS_GROUPS.get(language, ()) if code != language]
+        for rank in ranks:
+            rank.extend(
+                alias + expanded[len(language) :]
+                for expanded in list(rank)
+                for alias in aliases
+            )
+
+        return [list(dict.fromkeys(rank)) for rank in ranks]
+
+    def build_match_table(self) -> Dict[str, str]:
+        """
+        Build the table of locale links every matched language tag resolves to
+
+        Lower ranks win over higher ones, and earlier locales over later ones
+        of the same rank, so a lookup walking a visitor's tag from most to
+        least specific finds the best locale with dictionary hits only.
+
+        Returns:
+            Locale link of every lowercased language tag
+        """
+        expanded = [(locale, self.expand_tag(locale.lang)) for locale in self.locales]
+
+        table: Dict[str, str] = {}
+        for rank in range(3):
+            for locale, ranks in expanded:
+                for tag in ranks[rank]:
+                    table.setdefault(tag, self.links.get(locale.lang, locale.link))
+        return table
+
+    def lookup(self, table: Dict[str, str], tag: str) -> Optional[str]:
+        """
+        Look up a visitor's language tag, truncating it until it matches
+
+        Args:
+            table: Match table built by build_match_table
+            tag: Language tag sent by the visitor
+
+        Returns:
+            Locale link, or None if no locale matches
+        """
+        tag = tag.lower().replace("_", "-")
+        while tag:
+            if tag in table:
+                return table[tag]
+            tag = truncate_tag(tag)
+        return None
+
+    def negotiate(
+        self, table: Dict[str, str], accept_language: str, default: str
+    ) -> str:
+        """
+        Negotiate the locale of an Accept-Language header
+
+        Args:
+            table: Match table built by build_match_table
+            accept_language: Accept-Language header, e.g. "zh-TW,zh;q=0.9"
+            default: Link returned if no language matches
+
+        Returns:
+            Locale link of the most preferred matching language
+        """
+        preferences = []
+        for item in accept_language.split(","):
+            tag, _, params = item.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    continue
+            if tag and tag != "*" and quality > 0:
+                preferences.append((tag, quality))
+
+        for tag, _ in sorted(preferences, key=lambda item: -item[1]):
+            link = self.lookup(table, tag)
+            if link is not None:
+                return link
+        return default
@@ -0,0 +1,116 @@
+"""Writing of generated files for MkDocs Material i18n Plugin"""
+
+import hashlib
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Tuple, Union
+
+from mkdocs.plugins import get_plugin_logger
+
+log = get_plugin_logger(__name__)
+
+
+def file_digest(path: str) -> Optional[bytes]:
+    """Get the SHA-256 digest of a file, None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    return digest.digest()
+
+
+def _commit(temp_path: str, path: str) -> bool:
+    """Move a temporary file over its target, unless both have the same content"""
+    try:
+        target = os.stat(path)
+    except FileNotFoundError:
+        target = None
+
+    if (
+        target is not None
+        and target.st_size == os.path.getsize(temp_path)
+        and file_digest(temp_path) == file_digest(path)
+    ):
+        os.remove(temp_path)
+        log.debug(f"Skipped unchanged {path}")
+        return False
+
+    if target is not None:
+        os.chmod(temp_path, stat.S_IMODE(target.st_mode))
+    os.replace(temp_path, path)
+    return True
+
+
+def _create_temp_file(directory: str) -> Tuple[int, str]:
+    """
+    Create a uniquely named temporary file in a directory
+
+    Unlike tempfile.mkstemp, which always uses 0600, the file gets the
+    permissions open() gives new files under the process umask.
+
+    Returns:
+        Open file descriptor and path of the file
+    """
+    while True:
+        path = os.path.join(directory, f".i18n-{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a file for streaming output that replaces the target only once complete
+
+    Output goes to a temporary file next to the target, which is renamed
+    over it when the block exits without error, so readers never see a
+    partial file. The target is left untouched if its content is the same.
+    The directory of the target must exist.
+
+    Args:
+        path: Path of the file to write
+        mode: "w" for UTF-8 text or "wb" for bytes
+
+    Yields:
+        File object to write to
+    """
+    fd, temp_path = _create_temp_file(os.path.dirname(path) or ".")
+    try:
+        with open(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        _commit(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_file(path: str, content: Union[str, bytes]) -> bool:
+    """
+    Write a generated file, skipping it if its content did not change
+
+    Unchanged files keep their mtime, so deploy tools syncing by mtime or
+    checksum and the live reload of `mkdocs serve` leave them alone.
+
+    Args:
+        path: Path of the file to write, in an existing directory
+        content: Text, written as UTF-8, or bytes
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if file_digest(path) == hashlib.sha256(data).digest():
+        log.debug(f"Skipped unchanged {path}")
+        return False
+
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+    return True
@@ -1,26 +1,213 @@
 """MkDocs Material i18n Plugin"""
 
-from mkdocs.plugins import BasePlugin, get_plugin_logger
+import os
+import weakref
+from typing import Dict, Optional
+
+from mkdocs.plugins import (
+    BasePlugin,
+    CombinedEvent,
+    event_priority,
+    get_plugin_logger,
+)
 from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
 from mkdocs.structure.nav import Navigation
 
+from .cache import CLEAR_CACHE_ENV, BuildCache
 from .config import MaterialI18nPluginConfig
-from .index import IndexPageManager
+from .dirty import DirtyLocaleTracker, get_anchor_ids
+from .index import REMEMBER_LANGUAGE_SCRIPT_PATH, IndexPageManager
 from .language import LanguageManager
 from .navigation import NavigationManager
-from .locale_mapper import get_locale_mapper
+from .redirects import RedirectRulesManager, RedirectStubManager
+from .locale_mapper import LocaleMapper
+from .search import SearchIndexManager
+from .sitemap import SitemapManager
 
 log = get_plugin_logger(__name__)
 
 
+class SiteState:
+    """State of a site kept across its builds
+
+    MkDocs creates plugin instances for every config it loads, and `mkdocs
+    serve` loads the config again for every rebuild. Each plugin owns the
+    state of its own build, and the plugin of the config serve started with
+    shares its state with the rebuilds of the session, see on_serve.
+    """
+
+    def __init__(self):
+        # Language navigations of the last serve rebuild, keyed by lang
+        self.nav_cache: dict = {}
+        # Compiled custom index templates, keyed by path
+        self.index_templates: dict = {}
+        # Locales changed between `mkdocs serve` rebuilds
+        self.dirty_tracker = DirtyLocaleTracker()
+        # Set once `mkdocs serve` serves the site, its rebuilds follow
+        self.serving = False
+
+
+# States of the sites being served, keyed by the temporary site_dir of their
+# serve session. Only the plugin serve started with holds them, so they are
+# dropped along with its config once the session ends
+_serve_states: "weakref.WeakValueDictionary[str, SiteState]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class I18nBuild:
+    """State of a single build of a site
+
+    Everything derived from a build lives here, keyed by its config, rather
+    than on the plugin itself, and is dropped once the build ends.
+    """
+
+    def __init__(
+        self,
+        plugin_config: MaterialI18nPluginConfig,
+        nav_cache: Optional[dict],
+        template_cache: Optional[dict] = None,
+        build_cache: Optional[BuildCache] = None,
+        production_url: Optional[str] = None,
+        dirty_tracker: Optional[DirtyLocaleTracker] = None,
+        serving: bool = False,
+        split_build: bool = False,
+    ):
+        """
+        Initialize the build state
+
+        Args:
+            plugin_config: Plugin configuration the build was started with
+            nav_cache: Language navigations kept across rebuilds of the site,
+                None to build them for this build only
+            template_cache: Compiled custom index templates kept across rebuilds
+            build_cache: On-disk cache of derived structures kept across builds
+            production_url: URL of the production site, links to locales
+                that are not built point there, None to link them in this site
+            dirty_tracker: Tracker of the locales changed since the last serve
+                rebuild, None to render every locale
+            serving: The build is a rebuild of `mkdocs serve`, language
+                navigations are built when their first page is rendered
+            split_build: Build part of a split build, leaving the files
+                linking every locale to split.py
+        """
+        self.config = plugin_config
+        self.dirty_tracker = dirty_tracker
+        self.serving = serving
+        self.split_build = split_build
+        # Previous output of the pages of unchanged locales, keyed by dest_uri
+        self.reused_outputs: Dict[str, str] = {}
+
+        # Locales outside of build_locales are only linked, at their production URL
+        self.build_locales = plugin_config.get_build_locales()
+        skipped_locales = [
+            locale
+            for locale in plugin_config.locales
+            if locale not in self.build_locales
+        ]
+        production_urls = {}
+        if production_url:
+            production_urls = {
+                locale.lang: production_url.rstrip("/") for locale in skipped_locales
+            }
+        production_links = {
+            locale.lang: production_urls[locale.lang] + locale.link
+            for locale in skipped_locales
+            if locale.lang in production_urls
+        }
+
+        # Initialize the build's locale mapper first
+        self.locale_mapper = LocaleMapper()
+        self.locale_mapper.initialize(
+            plugin_config.locales, plugin_config.get_root_locale()
+        )
+
+        self.language_manager = LanguageManager(
+            plugin_config.locales,
+            self.locale_mapper,
+            plugin_config.default_locale,
+            plugin_config.alternate_fallback,
+            production_urls,
+        )
+        self.navigation_manager = NavigationManager(
+            self.build_locales,
+            self.locale_mapper,
+            nav_cache,
+            plugin_config.derive_nav,
+            build_cache,
+            serving,
+        )
+        self.search_index_manager = SearchIndexManager(
+            self.build_locales,
+            self.locale_mapper,
+            plugin_config.search_workers,
+            plugin_config.search_segmenters,
+        )
+        self.sitemap_manager = SitemapManager(
+            self.build_locales, plugin_config.default_locale
+        )
+        self.index_manager = IndexPageManager(
+            plugin_config.locales,
+            plugin_config.default_locale,
+            plugin_config.remember_language,
+            plugin_config.prefetch,
+            template_cache,
+            production_links,
+        )
+        self.redirect_stub_manager = RedirectStubManager(
+            plugin_config.locales,
+            self.locale_mapper,
+            plugin_config.default_locale,
+            plugin_config.remember_language,
+            production_links,
+        )
+
+    def index_files(self, files: Files) -> None:
+        """
+        Classify every file by locale and index the translations of every page
+
+        Only reads the files, so it can run outside of MkDocs events, e.g.
+        to write the files linking every locale of a split build.
+
+        Args:
+            files: Files of the site, including locales that are not built
+        """
+        self.locale_mapper.classify_files(files)
+        self.locale_mapper.move_root_locale_files(files)
+        self.language_manager.build_counterpart_index(files)
+
+
 class MaterialI18nPlugin(BasePlugin[MaterialI18nPluginConfig]):
     """MkDocs Material i18n Plugin that enhances i18n support for MkDocs Material"""
 
     def __init__(self):
         super().__init__()
-        self.language_manager = None
-        self.navigation_manager = None
+        # State of the builds in progress, keyed by id of their config
+        self.builds: Dict[int, I18nBuild] = {}
+        # Set by split.py while it builds some locales of a split build, which
+        # writes the files of the whole site once, see split_mode
+        self.split_build = False
+        # State of the builds of this config, or of the serve session it started
+        self.site_state = SiteState()
+
+    def get_build(self, config: MkDocsConfig) -> Optional[I18nBuild]:
+        """Get the state of the build using the given config, if any"""
+        return self.builds.get(id(config))
+
+    def get_build_cache(self, config: MkDocsConfig) -> Optional[BuildCache]:
+        """Open the on-disk build cache if cache_dir is set, relative to the config file"""
+        if not self.config.cache_dir:
+            return None
+
+        cache_dir = os.path.join(
+            os.path.dirname(config.config_file_path or ""), self.config.cache_dir
+        )
+        build_cache = BuildCache(cache_dir, self.config.cache_max_size * 1024 * 1024)
+        if os.environ.get(CLEAR_CACHE_ENV):
+            build_cache.clear()
+        return build_cache
 
     def on_config(self, config: MkDocsConfig) -> MkDocsConfig:
         """Called when the config is loaded"""
@@ -29,26 +216,94 @@ class MaterialI18nPlugin(BasePlugin[MaterialI18nPluginConfig]):
         config = self.config.process_locales_config(config)
 
         if self.config.locales:
-            # Initialize the locale mapper singleton first
-            locale_mapper = get_locale_mapper()
-            locale_mapper.initialize(self.config.locales)
-
-            self.language_manager = LanguageManager(self.config.locales)
-            self.navigation_manager = NavigationManager(self.config.locales)
+            site_state = _serve_states.get(config.site_dir, self.site_state)
+            dirty_tracker = None
+            if self.config.dirty_locales:
+                dirty_tracker = site_state.dirty_tracker
+            self.builds[id(config)] = I18nBuild(
+                self.config,
+                site_state.nav_cache if site_state.serving else None,
+                site_state.index_templates,
+                self.get_build_cache(config),
+                None if self.split_build else config.site_url,
+                dirty_tracker,
+                site_state.serving,
+                self.split_build,
+            )
+            if (
+                not self.split_build
+                and not config.site_url
+                and len(self.config.get_build_locales()) < len(self.config.locales)
+            ):
+                log.warning(
+                    "build_locales without site_url, links to locales that are not built will not resolve"
+                )
             log.debug(
                 f"Automatically configured {len(self.config.locales)} language options for Material theme"
             )
 
+            # Load the script remembering the language picked in the switcher
+            if self.config.remember_language:
+                config.extra_javascript.append(REMEMBER_LANGUAGE_SCRIPT_PATH)
+
         return config
 
+    def on_serve(self, server, /, *, config: MkDocsConfig, builder):
+        """Called once `mkdocs serve` built the site, its rebuilds reuse the site state"""
+        self.site_state.serving = True
+        _serve_states[config.site_dir] = self.site_state
+        if self.config.dirty_locales:
+            self.site_state.dirty_tracker.load_outputs(config.site_dir)
+        return server
+
+    def on_files(self, files: Files, config: MkDocsConfig) -> Files:
+        """Called when the files collection is created, classify every file by locale once"""
+
+        build = self.get_build(config)
+        if build:
+            # Index translations of every locale, including those not built
+            build.index_files(files)
+            if len(build.build_locales) < len(build.config.locales):
+                build.locale_mapper.remove_locale_files(files, build.build_locales)
+                log.info(
+                    "Building locales: "
+                    + ", ".join(locale.lang for locale in build.build_locales)
+                )
+
+            # Write the previous output of locales unchanged since the last rebuild
+            if build.dirty_tracker is not None:
+                clean_locales = build.dirty_tracker.get_clean_locales(
+                    files, build.locale_mapper, build.build_locales, config
+                )
+                if clean_locales and build.serving:
+                    # Their navigations are never asked for, so never built
+                    build.reused_outputs = build.dirty_tracker.reuse_pages(
+                        files, build.locale_mapper, clean_locales
+                    )
+            build.navigation_manager.build_language_files(files)
+
+            script = build.index_manager.generate_remember_language_script()
+            if script:
+                files.append(
+                    File.generated(
+                        config, REMEMBER_LANGUAGE_SCRIPT_PATH, content=script
+                    )
+                )
+
+        return files
+
     def on_nav(self, nav: Navigation, config: MkDocsConfig, files) -> Navigation:
         """Called when the navigation is created, build language-specific navigations"""
 
-        if self.navigation_manager:
+        build = self.get_build(config)
+        if build:
             # Build navigation structures for each language
-            self.navigation_manager.build_language_navigations(nav, files, config)
+            build.navigation_manager.build_language_navigations(nav, files, config)
             log.debug("Built language-specific navigations")
 
+            # Precompute language, site name and alternates of every page
+            build.language_manager.build_page_configs(files, config)
+
         return nav
 
     def on_page_context(
@@ -56,25 +311,129 @@ class MaterialI18nPlugin(BasePlugin[MaterialI18nPluginConfig]):
     ) -> dict:
         """Called when the page context is created, allowing modification of template variables"""
 
-        # Set page language first
-        if self.language_manager:
-            context = self.language_manager.modify_page_context(context, page, config)
+        build = self.get_build(config)
+        if build and page.file.dest_uri in build.reused_outputs:
+            # The output is replaced, keep the template from rendering any nav
+            context["nav"] = Navigation([], [])
+        elif build:
+            # Set page language first
+            context = build.language_manager.modify_page_context(context, page, config)
 
-        # Modify navigation based on page language
-        if self.navigation_manager:
-            context = self.navigation_manager.modify_navigation_context(context, page)
+            # Modify navigation based on page language
+            context = build.navigation_manager.modify_navigation_context(context, page)
 
         return context
 
+    def on_page_read_source(self, page: Page, config: MkDocsConfig) -> Optional[str]:
+        """Called when a page is read, skip the Markdown of reused pages"""
+
+        build = self.get_build(config)
+        if build and page.file.dest_uri in build.reused_outputs:
+            return ""
+
+        return None
+
+    def on_page_content(
+        self, html: str, page: Page, config: MkDocsConfig, files: Files
+    ) -> str:
+        """Called after a page is rendered, restore the anchors of reused pages"""
+
+        build = self.get_build(config)
+        if build and page.file.dest_uri in build.reused_outputs:
+            # Links from other pages are validated against them
+            page.present_anchor_ids = get_anchor_ids(
+                build.reused_outputs[page.file.dest_uri]
+            )
+
+        return html
+
+    def _add_search_shard_script(
+        self, output: str, page: Page, config: MkDocsConfig
+    ) -> str:
+        """Called after the page is rendered, point its search to the locale shard"""
+
+        build = self.get_build(config)
+        if build and build.config.search_shards:
+            output = build.search_index_manager.add_search_shard_script(output, page)
+
+        return output
+
+    # Keep the output once every other plugin changed it
+    @event_priority(-200)
+    def _reuse_page_output(self, output: str, page: Page, config: MkDocsConfig) -> str:
+        """Called after the page is rendered, write the previous output of reused pages
+
+        The output of rendered pages is kept for the next serve rebuild.
+        """
+
+        build = self.get_build(config)
+        if not build or build.dirty_tracker is None or not build.serving:
+            return output
+
+        reused_output = build.reused_outputs.get(page.file.dest_uri)
+        if reused_output is not None:
+            return reused_output
+
+        lang = build.locale_mapper.get_lang_by_page(page)
+        if lang:
+            build.dirty_tracker.store_output(lang, page.file.dest_uri, output)
+
+        return output
+
+    on_post_page = CombinedEvent(_add_search_shard_script, _reuse_page_output)
+
+    # Run after Material's search and offline plugins wrote the search index
+    @event_priority(-150)
     def on_post_build(self, config: MkDocsConfig, **kwargs):
         """Called after the build process is complete"""
-        if not self.config.locales:
+        build = self.builds.pop(id(config), None)
+        if not build:
             return
 
-        # Create index page generator
-        index_generator = IndexPageManager(
-            self.config.locales, self.config.default_locale
-        )
+        if build.dirty_tracker is not None:
+            build.dirty_tracker.commit()
+
+        if build.config.search_shards:
+            build.search_index_manager.write_search_shards(config)
+
+        if not build.split_build:
+            self.write_site_files(build, config)
+
+    def on_build_error(self, *, error: Exception) -> None:
+        """Called when a build fails, drop the state of the builds of this plugin"""
+        self.builds.clear()
+
+    def write_site_files(self, build: I18nBuild, config: MkDocsConfig) -> None:
+        """
+        Write the files linking every locale of the site
+
+        Args:
+            build: State of the build, its counterparts must be indexed
+            config: MkDocs configuration object
+        """
+        if build.config.sitemaps:
+            build.sitemap_manager.write_sitemaps(
+                config, build.language_manager.counterparts
+            )
+
+        # Redirect old unprefixed links after every page has been written
+        if build.config.redirect_stubs:
+            build.redirect_stub_manager.write_redirect_stubs(
+                config, build.language_manager.counterparts
+            )
+
+        # The default locale's home page is the index.html at the site root
+        if build.config.default_locale_at_root:
+            return
 
         # Generate and create the index.html file
+        index_generator = build.index_manager
         index_generator.create_index_file(config)
+
+        # Generate server-side redirect rules from the same language map
+        if build.config.redirect_rules:
+            rules_generator = RedirectRulesManager(
+                index_generator.build_language_map(),
+                index_generator.get_default_link(),
+            )
+            rules_generator.write_redirect_rules(config, build.config.redirect_rules)
@@ -0,0 +1,340 @@
+"""Server-side language redirect rules for MkDocs Material i18n Plugin"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+
+from .config import LocaleConfig
+from .index import REMEMBER_LANGUAGE_STORAGE
+from .language import group_translations
+from .locale_mapper import LocaleMapper
+from .negotiation import LanguageNegotiator
+from .output import write_file
+
+log = get_plugin_logger(__name__)
+
+# File written to the site directory for every supported server
+REDIRECT_RULE_FILES = {
+    "nginx": "i18n-redirects.conf",
+    "apache": ".htaccess",
+    "netlify": "_redirects",
+}
+
+_BLOCK_START = "# BEGIN mkdocs-material-i18n"
+_BLOCK_END = "# END mkdocs-material-i18n"
+_BLOCK = re.compile(
+    re.escape(_BLOCK_START) + r".*?" + re.escape(_BLOCK_END) + r"\n?", re.DOTALL
+)
+
+
+class RedirectRulesManager:
+    """Generates Accept-Language redirect rules of the site root for web servers"""
+
+    def __init__(self, language_map: Dict[str, str], default_link: str):
+        """
+        Initialize the redirect rules generator
+
+        Args:
+            language_map: Locale link of every language code, see
+                IndexPageManager.build_language_map
+            default_link: Link of the default locale
+        """
+        self.language_map = language_map
+        self.default_link = default_link
+
+    def get_ordered_rules(self) -> List[Tuple[str, str]]:
+        """
+        Get the language codes and links in the order servers must test them
+
+        Servers use the first matching rule, so codes with more subtags come
+        first, e.g. "zh-tw" must be tested before "zh".
+
+        Returns:
+            List of (language code, link) pairs
+        """
+        return sorted(self.language_map.items(), key=lambda item: -item[0].count("-"))
+
+    def generate_nginx_rules(self) -> str:
+        """Generate an nginx map of Accept-Language to locale links
+
+        Only the first, preferred language of the header is tested, unlike
+        the negotiation of the root index.html.
+        """
+        lines = [
+            "# Include in the http block, then redirect the site root with:",
+            "#   location = / {",
+            "#     add_header Vary Accept-Language;",
+            "#     return 302 $i18n_locale;",
+            "#   }",
+            "map $http_accept_language $i18n_locale {",
+            f"    default {self.default_link};",
+        ]
+        for lang_code, link in self.get_ordered_rules():
+            lines.append(f"    ~*^{re.escape(lang_code)}\\b {link};")
+        lines.append("}")
+        return "\n".join(lines)
+
+    def generate_apache_rules(self) -> str:
+        """Generate Apache rewrite rules redirecting the site root by Accept-Language
+
+        mod_rewrite adds Accept-Language to the Vary header of the redirects
+        itself, as the conditions test that request header. Only the first,
+        preferred language of the header is tested, as for nginx.
+        """
+        lines = ["RewriteEngine On"]
+        for lang_code, link in self.get_ordered_rules():
+            lines.append(
+                f"RewriteCond %{{HTTP:Accept-Language}} ^{re.escape(lang_code)}\\b [NC]"
+            )
+            lines.append(f"RewriteRule ^$ {link} [R=302,L]")
+        lines.append(f"RewriteRule ^$ {self.default_link} [R=302,L]")
+        return "\n".join(lines)
+
+    def generate_netlify_rules(self) -> str:
+        """Generate Netlify _redirects rules redirecting the site root by language
+
+        Rules are forced, as Netlify skips redirects of paths with a file
+        and the root index.html is always written.
+        """
+        lines = [
+            f"/  {link}  302!  Language={lang_code}"
+            for lang_code, link in self.get_ordered_rules()
+        ]
+        lines.append(f"/  {self.default_link}  302!")
+        return "\n".join(lines)
+
+    def generate_rules(self, server: str) -> str:
+        """
+        Generate the redirect rules of a server
+
+        Args:
+            server: One of "nginx", "apache" or "netlify"
+
+        Returns:
+            Rules wrapped in markers, so they can be replaced on the next build
+        """
+        generate = getattr(self, f"generate_{server}_rules")
+        return f"{_BLOCK_START}\n{generate()}\n{_BLOCK_END}\n"
+
+    def write_redirect_rules(
+        self, config: MkDocsConfig, servers: List[str]
+    ) -> List[str]:
+        """
+        Write the redirect rules of the given servers to the site directory
+
+        Rules are put in front of the rules of an existing file, e.g. a
+        `_redirects` copied from docs_dir, replacing rules of a previous build.
+
+        Args:
+            config: MkDocs configuration object
+            servers: Servers to write rules for
+
+        Returns:
+            Paths of the written files
+        """
+        paths = []
+        for server in servers:
+            path = os.path.join(config.site_dir, REDIRECT_RULE_FILES[server])
+
+            existing = ""
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    existing = _BLOCK.sub("", f.read())
+
+            if write_file(path, self.generate_rules(server) + existing):
+                log.debug(f"Created {server} redirect rules at {path}")
+            paths.append(path)
+
+        return paths
+
+
+# Script shared by all redirect stubs, sends a stub to the page in the best locale
+REDIRECT_STUB_SCRIPT = """(function () {{
+  const LANGUAGE_MAP = {language_map};
+  const DEFAULT_LANGUAGE = "{default_link}";
+
+  const script = document.currentScript;
+  const root = new URL(".", script.src);
+  const links = script.dataset.links.split(" ");
+  const userLangs =
+    navigator.languages && navigator.languages.length
+      ? navigator.languages
+      : [navigator.language || ""];
+
+  function rememberedLang() {{
+    {remembered_lang}
+  }}
+
+  function negotiate() {{
+    const remembered = rememberedLang();
+    for (const userLang of remembered ? [remembered, ...userLangs] : userLangs) {{
+      let tag = userLang.toLowerCase().replace(/_/g, "-");
+      while (tag) {{
+        if (Object.prototype.hasOwnProperty.call(LANGUAGE_MAP, tag)) {{
+          return LANGUAGE_MAP[tag];
+        }}
+        tag = tag.includes("-") ? tag.replace(/(-[a-z0-9])?-[^-]*$/, "") : "";
+      }}
+    }}
+    return DEFAULT_LANGUAGE;
+  }}
+
+  // Only send readers to locales that have a translation of the page
+  let link = negotiate();
+  if (!links.includes(link)) {{
+    link = links.includes(DEFAULT_LANGUAGE) ? DEFAULT_LANGUAGE : links[0];
+  }}
+  // Links of locales in the site are relative to its root, others absolute
+  const base = link.startsWith("/") ? link.slice(1) : link;
+  const path = location.pathname.slice(root.pathname.length);
+  location.replace(new URL(base + path + location.search + location.hash, root));
+}})();
+"""
+
+REDIRECT_STUB_TEMPLATE = (
+    '<!DOCTYPE html><meta charset="utf-8"><title>Redirecting...</title>'
+    '<script src="{script}" data-links="{links}"></script>'
+    '<noscript><meta http-equiv="refresh" content="0;url={fallback}"></noscript>\n'
+)
+
+
+class RedirectStubManager:
+    """Writes redirect stubs at the unprefixed path of every translated page"""
+
+    def __init__(
+        self,
+        locales: List[LocaleConfig],
+        locale_mapper: LocaleMapper,
+        default_locale: LocaleConfig,
+        remember_language: Optional[str] = None,
+        links: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the redirect stub generator
+
+        Args:
+            locales: List of locale configurations from plugin config
+            locale_mapper: Locale mapper of the build
+            default_locale: Default locale configuration
+            remember_language: Storage of the language picked in the language
+                switcher, "cookie" or "local_storage", None to not read it
+            links: Link of every locale keyed by lang, if not its URL in the
+                site, e.g. the production URL of locales that are not built
+        """
+        self.locales = locales
+        self.locale_mapper = locale_mapper
+        self.default_locale = default_locale
+        self.remember_language = remember_language
+        self.links = links or {}
+
+    def get_link(self, locale: LocaleConfig) -> str:
+        """Get the link of the home page of a locale, see __init__"""
+        return self.links.get(locale.lang, self.locale_mapper.get_url(locale))
+
+    def get_page_link(self, url: str, lang: str, stub_uri: str) -> str:
+        """
+        Get the link from a stub to the translation of its page in a locale
+
+        Args:
+            url: Page URL of the translation, e.g. "/zh/guide/"
+            lang: Language code of the translation
+            stub_uri: Path of the stub relative to the site directory
+
+        Returns:
+            Link relative to the stub, or absolute for locales with a link
+        """
+        locale = self.locale_mapper.get_locale_by_lang(lang)
+        if lang in self.links:
+            return self.links[lang] + url[len(self.locale_mapper.get_url(locale)) :]
+
+        link = posixpath.relpath(url, "/" + posixpath.dirname(stub_uri))
+        return link + "/" if url.endswith("/") else link
+
+    def generate_script(self) -> str:
+        """
+        Generate the redirect script shared by all stubs
+
+        Returns:
+            JavaScript source
+        """
+        links = {locale.lang: self.get_link(locale) for locale in self.locales}
+        language_map = LanguageNegotiator(self.locales, links).build_match_table()
+
+        remembered_lang = "return null;"
+        if self.remember_language:
+            _, remembered_lang = REMEMBER_LANGUAGE_STORAGE[self.remember_language]
+            remembered_lang = remembered_lang.replace("\n", "\n    ")
+
+        return REDIRECT_STUB_SCRIPT.format(
+            language_map=json.dumps(language_map, ensure_ascii=False),
+            default_link=links[self.default_locale.lang],
+            remembered_lang=remembered_lang,
+        )
+
+    def get_stub_uri(self, relative_url: str, use_directory_urls: bool) -> str:
+        """Get the path of the stub of a page URL relative to the site directory"""
+        if use_directory_urls or relative_url.endswith("/"):
+            return posixpath.join(relative_url, "index.html")
+        return relative_url
+
+    def write_redirect_stubs(
+        self, config: MkDocsConfig, counterparts: Dict[Tuple[str, str], str]
+    ) -> int:
+        """
+        Write the shared redirect script and a stub for every translated page (called in on_post_build event)
+
+        Stubs are streamed to the site directory one at a time and reference
+        the script by its content hash, so it can be cached indefinitely.
+        Paths already taken by a built file are left untouched.
+
+        Args:
+            config: MkDocs configuration object
+            counterparts: Page URL of every translation, see LanguageManager
+
+        Returns:
+            Number of stubs written
+        """
+        script = self.generate_script()
+        digest = hashlib.sha256(script.encode("utf-8")).hexdigest()[:8]
+        script_uri = f"i18n-redirect.{digest}.js"
+        write_file(os.path.join(config.site_dir, script_uri), script)
+
+        default_lang = self.default_locale.lang
+        count = 0
+        for relative_url, urls in group_translations(counterparts).items():
+            if not relative_url:
+                continue
+
+            stub_uri = self.get_stub_uri(relative_url, config.use_directory_urls)
+            path = os.path.join(config.site_dir, *stub_uri.split("/"))
+            if os.path.exists(path):
+                continue
+
+            locale_links = [
+                self.get_link(self.locale_mapper.get_locale_by_lang(lang))
+                for lang in urls
+            ]
+            fallback_lang = default_lang if default_lang in urls else next(iter(urls))
+            fallback = self.get_page_link(urls[fallback_lang], fallback_lang, stub_uri)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_file(
+                path,
+                REDIRECT_STUB_TEMPLATE.format(
+                    script=posixpath.relpath(
+                        script_uri, posixpath.dirname(stub_uri) or "."
+                    ),
+                    links=escape(" ".join(locale_links)),
+                    fallback=escape(fallback),
+                ),
+            )
+            count += 1
+
+        log.info(f"Created {count} redirect stubs using {script_uri}")
+        return count
@@ -0,0 +1,299 @@
+"""Search index sharding for MkDocs Material i18n Plugin"""
+
+import importlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from jinja2.utils import htmlsafe_json_dumps
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.pages import Page
+
+from .config import LocaleConfig
+from .locale_mapper import LocaleMapper
+from .output import write_file
+
+log = get_plugin_logger(__name__)
+
+# Configuration script Material reads its base URL from
+_CONFIG_SCRIPT = re.compile(
+    r'(<script id="__config" type="application/json">)(.*?)(</script>)', re.DOTALL
+)
+
+# Loads the search index of the locale where Material loads the one of the
+# site, by XMLHttpRequest or, for pages opened from files, a script element
+SEARCH_SHARD_SCRIPT = (
+    "<script>(function(){{"
+    "var b=new URL({base},location.href),"
+    'i=new URL("search/search_index.",b).href,'
+    "s=new URL({shard},b).href,"
+    "m=function(u){{u=String(u);return u.indexOf(i)===0?s+u.slice(i.length):u}},"
+    "o=XMLHttpRequest.prototype.open,a=Node.prototype.appendChild;"
+    "XMLHttpRequest.prototype.open=function(t,u){{"
+    "arguments[1]=m(u);return o.apply(this,arguments)}};"
+    "Node.prototype.appendChild=function(n){{"
+    'if(n.tagName==="SCRIPT"&&n.src)n.src=m(n.src);return a.call(this,n)}}'
+    "}})()</script>"
+)
+
+# Separator of the tokens of segmenters, added to the search separator of
+# the shards they are applied to
+SEGMENT_SEPARATOR = "\u200b"
+
+# Runs of Han ideographs, segmented by segment_cjk
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def segment_cjk(text: str) -> str:
+    """
+    Segment runs of Han ideographs into single characters
+
+    A dictionary-free stand-in for a real Chinese segmenter such as jieba.
+    Tokens are separated by zero-width spaces, like the segmentation of
+    Material's search plugin, which the separator of the shard splits on.
+
+    Args:
+        text: Title or text of a search document
+
+    Returns:
+        Text with every ideograph surrounded by zero-width spaces
+    """
+    return _CJK_RUN.sub(
+        lambda match: "\u200b" + "\u200b".join(match.group(0)) + "\u200b", text
+    ).strip("\u200b")
+
+
+def import_segmenter(path: str) -> Callable[[str], str]:
+    """
+    Import a segmenter from its "module:callable" path
+
+    Args:
+        path: Import path, e.g. "mkdocs_material_i18n.search:segment_cjk"
+
+    Returns:
+        Callable segmenting the title and text of search documents
+    """
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def build_search_shard(lang: str, shard: dict, segmenter: Optional[str] = None) -> str:
+    """
+    Build the search index shard of a single locale
+
+    Runs in a worker process when search_workers is set, so everything it
+    gets and returns is plain data and the segmenter is imported by path.
+    The languages of the shard's search pipeline are narrowed to the locale's
+    language if the search plugin is configured for it. With a segmenter, the
+    shard's separator also splits on the zero-width spaces between tokens.
+
+    Args:
+        lang: Language code of the locale
+        shard: Search index of the locale's documents
+        segmenter: Import path of the locale's segmenter, if any
+
+    Returns:
+        Serialized search index of the locale
+    """
+    index_config = dict(shard.get("config", {}))
+    base_lang = lang.split("-")[0].lower()
+    if base_lang in index_config.get("lang", []):
+        index_config["lang"] = [base_lang]
+
+    docs = shard.get("docs", [])
+    if segmenter:
+        segment = import_segmenter(segmenter)
+        docs = [
+            {
+                **doc,
+                **{key: segment(doc[key]) for key in ("title", "text") if key in doc},
+            }
+            for doc in docs
+        ]
+        separator = index_config.get("separator", r"[\s\-]+")
+        if SEGMENT_SEPARATOR not in separator:
+            index_config["separator"] = f"(?:{separator}|{SEGMENT_SEPARATOR})+"
+
+    return json.dumps(
+        {**shard, "config": index_config, "docs": docs}, separators=(",", ":")
+    )
+
+
+class SearchIndexManager:
+    """Splits Material's search index into one shard per locale"""
+
+    def __init__(
+        self,
+        locales: List[LocaleConfig],
+        locale_mapper: LocaleMapper,
+        search_workers: int = 0,
+        segmenters: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the search index manager
+
+        Args:
+            locales: List of locale configurations from plugin config
+            locale_mapper: Locale mapper of the build
+            search_workers: Number of processes building shards, sequential if below 2
+            segmenters: Import path of the segmenter of each language, keyed by lang
+        """
+        self.locales = locales
+        self.locale_mapper = locale_mapper
+        self.search_workers = search_workers
+        self.segmenters = segmenters or {}
+
+    def get_segmenter(self, locale: LocaleConfig) -> Optional[str]:
+        """Get the segmenter of a locale, falling back to its base language"""
+        segmenter = self.segmenters.get(locale.lang)
+        if segmenter is None:
+            segmenter = self.segmenters.get(locale.lang.split("-")[0])
+        return segmenter
+
+    def build_search_shards(self, index: dict) -> Dict[str, str]:
+        """
+        Build the serialized search index of every locale
+
+        Locales are built in a process pool if search_workers is set, as
+        segmenting and serializing large indexes is CPU bound.
+
+        Args:
+            index: Search index written by Material's search plugin
+
+        Returns:
+            Serialized search index of every locale, keyed by lang
+        """
+        shards = self.split_search_index(index)
+        args = [
+            (locale.lang, shards[locale.lang], self.get_segmenter(locale))
+            for locale in self.locales
+        ]
+
+        if self.search_workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(self.search_workers, len(args))
+            ) as executor:
+                data = list(executor.map(build_search_shard, *zip(*args)))
+        else:
+            data = [build_search_shard(*arg) for arg in args]
+
+        return {lang: shard for (lang, _, _), shard in zip(args, data)}
+
+    def get_link_dir(self, locale: LocaleConfig) -> str:
+        """Get the site directory of a locale relative to the site root, e.g. "en" """
+        return self.locale_mapper.get_url_dir(locale)
+
+    def split_search_index(self, index: dict) -> Dict[str, dict]:
+        """
+        Split a search index by the locale of each document location
+
+        Locations stay relative to the site root, which Material resolves
+        them against. Documents outside of any locale are left out of the
+        shards.
+
+        Args:
+            index: Search index written by Material's search plugin
+
+        Returns:
+            Search index of every locale, keyed by lang
+        """
+        docs: Dict[str, list] = {locale.lang: [] for locale in self.locales}
+        for doc in index.get("docs", []):
+            location = doc.get("location", "")
+            locale = self.locale_mapper.detect_locale_from_url(location.split("#")[0])
+            if locale:
+                docs[locale.lang].append(doc)
+
+        return {
+            lang: {**index, "docs": locale_docs} for lang, locale_docs in docs.items()
+        }
+
+    def write_search_shards(self, config: MkDocsConfig) -> int:
+        """
+        Write the search index shard of every locale (called in on_post_build event)
+
+        Shards are written next to each locale's pages, at
+        ``<link>/search/search_index.json``. If the offline plugin inlined the
+        index into ``search_index.js``, the shards are inlined as well.
+
+        Args:
+            config: MkDocs configuration object
+
+        Returns:
+            Number of shards written
+        """
+        search_dir = os.path.join(config.site_dir, "search")
+        index_path = os.path.join(search_dir, "search_index.json")
+        if not os.path.isfile(index_path):
+            log.debug("No search index found, skipping search index sharding")
+            return 0
+
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        inline = os.path.isfile(os.path.join(search_dir, "search_index.js"))
+
+        shards = self.build_search_shards(index)
+        for locale in self.locales:
+            locale_dir = os.path.join(config.site_dir, self.get_link_dir(locale))
+            shard_dir = os.path.join(locale_dir, "search")
+            os.makedirs(shard_dir, exist_ok=True)
+
+            data = shards[locale.lang]
+            write_file(os.path.join(shard_dir, "search_index.json"), data)
+            if inline:
+                write_file(
+                    os.path.join(shard_dir, "search_index.js"), f"var __index = {data}"
+                )
+
+        log.info(f"Split search index into {len(shards)} locale shards")
+        return len(shards)
+
+    def get_search_shard_script(self, base: str, locale: LocaleConfig) -> str:
+        """
+        Get the script loading the search index of a locale on its pages
+
+        Args:
+            base: Relative URL of the site root, e.g. "../.."
+            locale: Locale configuration of the page
+
+        Returns:
+            Script element, empty for locales built at the site root
+        """
+        link_dir = self.get_link_dir(locale)
+        if not link_dir:
+            return ""
+
+        return SEARCH_SHARD_SCRIPT.format(
+            base=htmlsafe_json_dumps((base.rstrip("/") or ".") + "/"),
+            shard=htmlsafe_json_dumps(f"{link_dir}/search/search_index."),
+        )
+
+    def add_search_shard_script(self, output: str, page: Page) -> str:
+        """
+        Point the search of a locale page to its locale shard (called in on_post_page event)
+
+        Only the request for the search index is redirected, the base URL of
+        Material, which it also resolves e.g. the versions of mike against,
+        is left alone.
+
+        Args:
+            output: Rendered HTML of the page
+            page: MkDocs Page instance
+
+        Returns:
+            HTML loading the script before Material's configuration
+        """
+        locale: Optional[LocaleConfig] = self.locale_mapper.get_locale_by_page(page)
+        if not locale:
+            return output
+
+        match = _CONFIG_SCRIPT.search(output)
+        if not match:
+            return output
+
+        base = json.loads(match.group(2)).get("base", ".")
+        script = self.get_search_shard_script(base, locale)
+        return output[: match.start()] + script + output[match.start() :]
@@ -0,0 +1,238 @@
+"""Sharded builds for MkDocs Material i18n Plugin
+
+Each shard builds some locales, e.g. on a CI runner of its own, and writes a
+manifest next to its output. Merging the shards combines their output and
+writes the files linking every locale from the manifests, without the docs
+or rendering any page.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from mkdocs.config import load_config
+from mkdocs.plugins import get_plugin_logger
+
+from . import __version__
+from .output import file_digest, write_file
+from .split import (
+    MANIFEST_FILE,
+    build_partial,
+    get_plugin,
+    load_site_state,
+    merge_site_dirs,
+    write_site_files,
+)
+
+log = get_plugin_logger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class ShardError(Exception):
+    """Raised when shards cannot be merged"""
+
+
+def get_shard_langs(langs: List[str], index: int, count: int) -> List[str]:
+    """
+    Get the langs a shard builds, locales are dealt to shards in turn
+
+    Args:
+        langs: Langs of every locale, in locale order
+        index: Number of the shard, from 1 to count
+        count: Number of shards
+
+    Returns:
+        Langs of the locales of the shard
+    """
+    if not 1 <= index <= count:
+        raise ShardError(f"Shard {index} is not between 1 and {count}")
+    return langs[index - 1 :: count]
+
+
+def write_manifest(
+    site_dir: str, langs: List[str], counterparts: Dict[Tuple[str, str], str]
+) -> dict:
+    """
+    Write the manifest of a shard's output
+
+    Args:
+        site_dir: Output directory of the shard
+        langs: Langs of the locales of the shard
+        counterparts: Page URL of every translation, of every locale
+
+    Returns:
+        Manifest listing the locales, page URLs, counterparts and the
+        SHA-256 of every output file of the shard
+    """
+    own_counterparts = [
+        [relative_url, lang, url]
+        for (relative_url, lang), url in counterparts.items()
+        if lang in langs
+    ]
+
+    files = {}
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, site_dir).replace(os.sep, "/")
+            if relative_path != MANIFEST_FILE:
+                files[relative_path] = file_digest(path).hex()
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "plugin_version": __version__,
+        "locales": langs,
+        "pages": [url for _, _, url in own_counterparts],
+        "counterparts": own_counterparts,
+        "files": dict(sorted(files.items())),
+    }
+    write_file(
+        os.path.join(site_dir, MANIFEST_FILE),
+        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+    )
+    return manifest
+
+
+def read_manifest(shard_dir: str) -> dict:
+    """
+    Read the manifest of a shard's output
+
+    Args:
+        shard_dir: Output directory of the shard
+
+    Returns:
+        Manifest written by write_manifest
+    """
+    path = os.path.join(shard_dir, MANIFEST_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ShardError(f"Failed to read the manifest of shard {shard_dir}: {e}")
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ShardError(f"Unsupported manifest version of shard {shard_dir}")
+
+    return manifest
+
+
+def verify_shard(shard_dir: str, manifest: dict) -> None:
+    """
+    Check that the files of a shard's output are the ones of its manifest
+
+    Args:
+        shard_dir: Output directory of the shard
+        manifest: Manifest read by read_manifest
+    """
+    for relative_path, digest in manifest["files"].items():
+        actual = file_digest(os.path.join(shard_dir, *relative_path.split("/")))
+        if actual is None or actual.hex() != digest:
+            raise ShardError(
+                f"'{relative_path}' of shard {shard_dir} does not match its manifest"
+            )
+
+
+def build_shard(
+    config_file: Optional[str],
+    site_dir: str,
+    langs: Optional[List[str]] = None,
+    index: Optional[int] = None,
+    count: Optional[int] = None,
+) -> dict:
+    """
+    Build the locales of a shard and write its manifest
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        site_dir: Output directory of the shard
+        langs: Langs of the locales to build
+        index: Number of the shard, if langs are dealt to count shards
+        count: Number of shards
+
+    Returns:
+        Manifest of the shard
+    """
+    _, plugin, build_state = load_site_state(config_file, site_dir)
+    all_langs = [locale.lang for locale in plugin.config.get_build_locales()]
+    if langs is None:
+        langs = get_shard_langs(all_langs, index or 1, count or 1)
+    unknown = [lang for lang in langs if lang not in all_langs]
+    if unknown:
+        raise ShardError(f"Locales {', '.join(unknown)} are not built by the site")
+
+    build_partial(config_file, langs, site_dir)
+    manifest = write_manifest(
+        site_dir, langs, build_state.language_manager.counterparts
+    )
+    log.info(
+        f"Built shard of {', '.join(langs)}: {len(manifest['pages'])} pages, "
+        f"{len(manifest['files'])} files"
+    )
+    return manifest
+
+
+def merge_shards(
+    config_file: Optional[str], shard_dirs: List[str], site_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Combine the output of shards and write the files linking every locale
+
+    Shard directories are left untouched. The root index.html, redirects and
+    sitemaps are written from the counterparts of the manifests, so neither
+    the files of docs_dir nor a page render is needed, only the config and
+    the theme's custom_dir.
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        shard_dirs: Output directories of the shards
+        site_dir: Site directory of the whole site, emptied first, the
+            one of the config if None
+
+    Returns:
+        Langs of the merged locales
+    """
+    manifests = [read_manifest(shard_dir) for shard_dir in shard_dirs]
+
+    owners: Dict[str, str] = {}
+    for shard_dir, manifest in zip(shard_dirs, manifests):
+        for lang in manifest["locales"]:
+            if lang in owners:
+                raise ShardError(
+                    f"Locale '{lang}' is built by both {owners[lang]} and {shard_dir}"
+                )
+            owners[lang] = shard_dir
+
+    for shard_dir, manifest in zip(shard_dirs, manifests):
+        verify_shard(shard_dir, manifest)
+
+    # The docs are not needed, an empty docs_dir keeps the config valid
+    with tempfile.TemporaryDirectory() as docs_dir:
+        config = load_config(config_file, site_dir=site_dir, docs_dir=docs_dir)
+        site_dir = config.site_dir
+
+        # Merge shards in locale order, as a single build writes them
+        order = [locale.lang for locale in get_plugin(config).config.locales]
+        shards = sorted(
+            zip(shard_dirs, manifests),
+            key=lambda shard: min(
+                (order.index(lang) for lang in shard[1]["locales"] if lang in order),
+                default=len(order),
+            ),
+        )
+
+        counterparts: Dict[Tuple[str, str], str] = {}
+        for _, manifest in shards:
+            for relative_url, lang, url in manifest["counterparts"]:
+                counterparts[(relative_url, lang)] = url
+
+        merge_site_dirs([shard_dir for shard_dir, _ in shards], site_dir, copy=True)
+        write_site_files(config_file, site_dir, counterparts, docs_dir)
+
+    langs = [lang for lang in order if lang in owners]
+    missing = [lang for lang in order if lang not in owners]
+    if missing:
+        log.warning(f"No shard built the locales {', '.join(missing)}")
+    log.info(f"Merged {len(shards)} shards of {', '.join(langs)} into {site_dir}")
+    return langs
@@ -0,0 +1,170 @@
+"""Per-locale sitemap generation for MkDocs Material i18n Plugin"""
+
+import gzip
+import io
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+
+from .config import LocaleConfig
+from .language import group_translations
+from .output import atomic_open
+
+log = get_plugin_logger(__name__)
+
+# Maximum number of URLs of a single sitemap file
+SITEMAP_MAX_URLS = 50000
+
+SITEMAP_INDEX_FILE = "sitemap-index.xml"
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+_URLSET_START = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+)
+
+
+@contextmanager
+def _open_gzip_text(path: str) -> Iterator[TextIO]:
+    """Open a gzip file for streaming text, with a fixed mtime for reproducible output"""
+    with atomic_open(path, "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as compressed:
+            with io.TextIOWrapper(compressed, encoding="utf-8") as f:
+                yield f
+
+
+class SitemapManager:
+    """Writes one sitemap per locale with hreflang alternates, and a sitemap index"""
+
+    def __init__(
+        self,
+        locales: List[LocaleConfig],
+        default_locale: Optional[LocaleConfig] = None,
+        max_urls: int = SITEMAP_MAX_URLS,
+    ):
+        """
+        Initialize the sitemap manager
+
+        Args:
+            locales: List of locale configurations from plugin config
+            default_locale: Default locale, linked as the x-default alternate
+            max_urls: Maximum number of URLs per sitemap file
+        """
+        self.locales = locales
+        self.default_locale = default_locale
+        self.max_urls = max_urls
+
+    def get_sitemap_names(self, locale: LocaleConfig, url_count: int) -> List[str]:
+        """
+        Get the file names of the sitemaps of a locale
+
+        Args:
+            locale: Locale configuration
+            url_count: Number of pages of the locale
+
+        Returns:
+            "sitemap-<lang>.xml.gz", or "sitemap-<lang>-<n>.xml.gz" for each
+            part if the locale has more than max_urls pages
+        """
+        parts = max(1, -(-url_count // self.max_urls))
+        if parts == 1:
+            return [f"sitemap-{locale.lang}.xml.gz"]
+        return [f"sitemap-{locale.lang}-{n}.xml.gz" for n in range(1, parts + 1)]
+
+    def write_sitemaps(
+        self, config: MkDocsConfig, counterparts: Dict[Tuple[str, str], str]
+    ) -> List[str]:
+        """
+        Write the sitemaps of every locale and the sitemap index (called in on_post_build event)
+
+        Entries are streamed to disk one page at a time. Every entry links
+        all existing translations of the page, and the default locale's one
+        as x-default.
+
+        Args:
+            config: MkDocs configuration object
+            counterparts: Page URL of every translation, see LanguageManager
+
+        Returns:
+            File names of the written sitemaps, without the sitemap index
+        """
+        if not config.site_url:
+            log.warning("Per-locale sitemaps require site_url to be set, skipping")
+            return []
+
+        site_url = config.site_url.rstrip("/") + "/"
+        translations = group_translations(counterparts)
+        default_lang = self.default_locale.lang if self.default_locale else None
+
+        sitemap_names = []
+        for locale in self.locales:
+            pages = [
+                (relative_url, urls)
+                for relative_url, urls in translations.items()
+                if locale.lang in urls
+            ]
+            names = self.get_sitemap_names(locale, len(pages))
+            for n, name in enumerate(names):
+                part = pages[n * self.max_urls : (n + 1) * self.max_urls]
+                self._write_sitemap(
+                    os.path.join(config.site_dir, name),
+                    locale,
+                    part,
+                    site_url,
+                    default_lang,
+                )
+            sitemap_names.extend(names)
+
+        self._write_sitemap_index(
+            os.path.join(config.site_dir, SITEMAP_INDEX_FILE), sitemap_names, site_url
+        )
+        log.info(
+            f"Created {len(sitemap_names)} sitemaps for {len(self.locales)} locales"
+        )
+        return sitemap_names
+
+    def _write_sitemap(
+        self,
+        path: str,
+        locale: LocaleConfig,
+        pages: List[Tuple[str, Dict[str, str]]],
+        site_url: str,
+        default_lang: Optional[str],
+    ) -> None:
+        """Stream the entries of a locale's pages to a gzipped sitemap"""
+        with _open_gzip_text(path) as f:
+            f.write(_XML_DECLARATION)
+            f.write(_URLSET_START)
+            for _, urls in pages:
+                f.write("  <url>\n")
+                f.write(
+                    f"    <loc>{escape(site_url + urls[locale.lang].lstrip('/'))}</loc>\n"
+                )
+                if len(urls) > 1:
+                    for lang, url in urls.items():
+                        href = quoteattr(site_url + url.lstrip("/"))
+                        f.write(
+                            f'    <xhtml:link rel="alternate" hreflang="{lang}" href={href}/>\n'
+                        )
+                    if default_lang in urls:
+                        href = quoteattr(site_url + urls[default_lang].lstrip("/"))
+                        f.write(
+                            f'    <xhtml:link rel="alternate" hreflang="x-default" href={href}/>\n'
+                        )
+                f.write("  </url>\n")
+            f.write("</urlset>\n")
+
+    def _write_sitemap_index(self, path: str, names: List[str], site_url: str) -> None:
+        """Write the sitemap index listing the sitemap of every locale"""
+        with atomic_open(path) as f:
+            f.write(_XML_DECLARATION)
+            f.write(
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            )
+            for name in names:
+                f.write(f"  <sitemap><loc>{escape(site_url + name)}</loc></sitemap>\n")
+            f.write("</sitemapindex>\n")
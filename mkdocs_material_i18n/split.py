@@ -0,0 +1,295 @@
+"""Split builds for MkDocs Material i18n Plugin
+
+A split build runs one MkDocs build per locale in a process pool, each into a
+staging directory of its own, then merges the staging directories into
+site_dir and writes the files linking every locale once.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.files import get_files
+from mkdocs.utils import clean_directory
+
+from .output import atomic_open, write_file
+from .plugin import I18nBuild, MaterialI18nPlugin
+
+log = get_plugin_logger(__name__)
+
+SEARCH_INDEX_FILE = "search/search_index.json"
+SEARCH_INDEX_SCRIPT_FILE = "search/search_index.js"
+SITEMAP_FILE = "sitemap.xml"
+SITEMAP_GZIP_FILE = "sitemap.xml.gz"
+# Written by shard builds, see shards.py
+MANIFEST_FILE = "i18n-manifest.json"
+
+_SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def get_plugin(config: MkDocsConfig) -> MaterialI18nPlugin:
+    """Get the instance of the plugin configured for a site"""
+    for plugin in config.plugins.values():
+        if isinstance(plugin, MaterialI18nPlugin):
+            return plugin
+    raise ValueError("The i18n plugin is not configured in the site")
+
+
+@contextmanager
+def split_mode(
+    config: MkDocsConfig, langs: Optional[List[str]] = None
+) -> Iterator[MaterialI18nPlugin]:
+    """
+    Make builds of a config part of a split build until the block exits
+
+    Such builds link the locales they do not build within the site and leave
+    the files linking every locale to write_site_files. The plugin is reset
+    once the block exits, so later builds of the config are whole builds.
+
+    Args:
+        config: MkDocs configuration object
+        langs: Langs of the locales to build, those of the config if None
+
+    Yields:
+        Plugin instance of the config
+    """
+    plugin = get_plugin(config)
+    build_locales = plugin.config.build_locales
+    plugin.split_build = True
+    if langs is not None:
+        plugin.config.build_locales = langs
+    try:
+        yield plugin
+    finally:
+        plugin.split_build = False
+        plugin.config.build_locales = build_locales
+
+
+def build_partial(config_file: Optional[str], langs: List[str], site_dir: str) -> None:
+    """
+    Build some locales of a site, as `mkdocs build` does
+
+    Only the pages of the locales are written, files linking every locale
+    of the site are left to write_site_files.
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        langs: Langs of the locales to build
+        site_dir: Directory the locales are built into
+    """
+    config = load_config(config_file, site_dir=site_dir)
+    with split_mode(config, langs):
+        config.plugins.on_startup(command="build", dirty=False)
+        try:
+            build(config)
+        finally:
+            config.plugins.on_shutdown()
+
+
+def _merge_search_indexes(paths: List[str], site_dir: str, inline: bool) -> None:
+    """Concatenate the search indexes of the locale builds
+
+    Pages of no locale are built by every locale build, their entries are
+    taken from the first build that has them.
+    """
+    merged = None
+    locations = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+        if merged is None:
+            merged = dict(index, docs=[])
+        for doc in index["docs"]:
+            if doc["location"] not in locations:
+                locations.add(doc["location"])
+                merged["docs"].append(doc)
+
+    os.makedirs(os.path.join(site_dir, "search"), exist_ok=True)
+    data = json.dumps(merged, separators=(",", ":"), default=str)
+    write_file(os.path.join(site_dir, SEARCH_INDEX_FILE), data)
+    if inline:
+        write_file(
+            os.path.join(site_dir, SEARCH_INDEX_SCRIPT_FILE), f"var __index = {data}"
+        )
+
+
+def _merge_sitemaps(paths: List[str], site_dir: str) -> None:
+    """Concatenate the entries of the sitemaps of the locale builds, once per URL"""
+    ElementTree.register_namespace("", _SITEMAP_NS)
+    tree = ElementTree.parse(paths[0])
+    root = tree.getroot()
+    locs = {url.findtext(f"{{{_SITEMAP_NS}}}loc") for url in root}
+    for path in paths[1:]:
+        for url in ElementTree.parse(path).getroot():
+            loc = url.findtext(f"{{{_SITEMAP_NS}}}loc")
+            if loc not in locs:
+                locs.add(loc)
+                root.append(url)
+
+    with atomic_open(os.path.join(site_dir, SITEMAP_FILE), "wb") as f:
+        tree.write(f, encoding="utf-8", xml_declaration=True)
+    with open(os.path.join(site_dir, SITEMAP_FILE), "rb") as f:
+        data = f.read()
+    write_file(os.path.join(site_dir, SITEMAP_GZIP_FILE), gzip.compress(data, mtime=0))
+
+
+def merge_site_dirs(staging_dirs: List[str], site_dir: str, copy: bool = False) -> int:
+    """
+    Move the output of the locale builds into the site directory
+
+    Files every build writes, e.g. theme assets, are taken from the first
+    build. The search index and sitemap of the builds are merged.
+
+    Args:
+        staging_dirs: Site directories of the locale builds, in locale order
+        site_dir: Site directory of the whole site, emptied first
+        copy: Copy files instead of moving them, keeping the staging directories
+
+    Returns:
+        Number of files moved
+    """
+    os.makedirs(site_dir, exist_ok=True)
+    clean_directory(site_dir)
+
+    search_indexes: List[str] = []
+    sitemaps: List[str] = []
+    inline = False
+    moved = 0
+    for staging_dir in staging_dirs:
+        for root, _, names in os.walk(staging_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                relative_path = os.path.relpath(path, staging_dir).replace(os.sep, "/")
+                if relative_path == SEARCH_INDEX_FILE:
+                    search_indexes.append(path)
+                elif relative_path == SEARCH_INDEX_SCRIPT_FILE:
+                    inline = True
+                elif relative_path == SITEMAP_FILE:
+                    sitemaps.append(path)
+                elif relative_path not in (SITEMAP_GZIP_FILE, MANIFEST_FILE):
+                    dest_path = os.path.join(site_dir, relative_path)
+                    if os.path.exists(dest_path):
+                        log.debug(f"Kept '{relative_path}' of the first locale build")
+                        continue
+                    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                    if copy:
+                        shutil.copy2(path, dest_path)
+                    else:
+                        shutil.move(path, dest_path)
+                    moved += 1
+
+    if search_indexes:
+        _merge_search_indexes(search_indexes, site_dir, inline)
+    if sitemaps:
+        _merge_sitemaps(sitemaps, site_dir)
+
+    log.info(f"Merged {moved} files of {len(staging_dirs)} locale builds")
+    return moved
+
+
+def load_site_state(
+    config_file: Optional[str],
+    site_dir: str,
+    counterparts: Optional[Dict[Tuple[str, str], str]] = None,
+    docs_dir: Optional[str] = None,
+) -> Tuple[MkDocsConfig, MaterialI18nPlugin, I18nBuild]:
+    """
+    Prepare the plugin state of a whole site without rendering pages
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        site_dir: Site directory holding the pages of every locale
+        counterparts: Page URL of every translation, indexed from the files
+            of docs_dir if None
+        docs_dir: Docs directory replacing the one of the config
+
+    Returns:
+        MkDocs configuration object, plugin instance and build state
+    """
+    config = load_config(config_file, site_dir=site_dir, docs_dir=docs_dir)
+    with split_mode(config) as plugin:
+        config = plugin.on_config(config)
+
+    build_state = plugin.builds.pop(id(config))
+    if counterparts is None:
+        build_state.index_files(get_files(config))
+    else:
+        build_state.language_manager.counterparts = counterparts
+    return config, plugin, build_state
+
+
+def write_site_files(
+    config_file: Optional[str],
+    site_dir: str,
+    counterparts: Optional[Dict[Tuple[str, str], str]] = None,
+    docs_dir: Optional[str] = None,
+) -> None:
+    """
+    Write the files linking every locale, e.g. the root index.html, without rendering pages
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        site_dir: Site directory holding the pages of every locale
+        counterparts: Page URL of every translation, indexed from the files
+            of docs_dir if None
+        docs_dir: Docs directory replacing the one of the config
+    """
+    config, plugin, build_state = load_site_state(
+        config_file, site_dir, counterparts, docs_dir
+    )
+    plugin.write_site_files(build_state, config)
+
+
+def split_build(
+    config_file: Optional[str] = None,
+    site_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Build every locale of a site as a separate MkDocs build, then merge them
+
+    Args:
+        config_file: Path of mkdocs.yml, None to look it up in the working directory
+        site_dir: Site directory, the one of the config if None
+        workers: Number of processes building locales, the number of CPUs if None
+
+    Returns:
+        Langs of the built locales
+    """
+    config = load_config(config_file, site_dir=site_dir)
+    site_dir = os.path.abspath(config.site_dir)
+    langs = [locale.lang for locale in get_plugin(config).config.get_build_locales()]
+
+    # Stage next to site_dir, so merging moves files instead of copying them
+    os.makedirs(os.path.dirname(site_dir), exist_ok=True)
+    staging_root = tempfile.mkdtemp(
+        prefix=".i18n-split-", dir=os.path.dirname(site_dir)
+    )
+    try:
+        staging_dirs = [os.path.join(staging_root, lang) for lang in langs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(
+                build_partial,
+                [config_file] * len(langs),
+                [[lang] for lang in langs],
+                staging_dirs,
+            ):
+                pass
+
+        merge_site_dirs(staging_dirs, site_dir)
+        write_site_files(config_file, site_dir)
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    log.info(f"Split build of {len(langs)} locales written to {site_dir}")
+    return langs
@@ -0,0 +1,49 @@
+"""Tests for the persistent build cache of MkDocs Material i18n Plugin"""
+
+import os
+import tempfile
+
+from mkdocs_material_i18n.cache import BuildCache
+
+
+def test_build_cache_round_trip():
+    """Test that entries are read back and missing entries are misses"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = BuildCache(os.path.join(temp_dir, "cache"), 1 << 20)
+        key = BuildCache.make_key("nav", "fingerprint")
+
+        assert cache.get(key) is None
+        cache.set(key, [["page", "en/index.md"]])
+
+        assert cache.get(key) == [["page", "en/index.md"]]
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert key != BuildCache.make_key("nav", "other fingerprint")
+
+
+def test_build_cache_evicts_least_recently_used():
+    """Test that the entries used longest ago are evicted beyond the size cap"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = BuildCache(temp_dir, 250)
+        value = "x" * 100
+        for n, key in enumerate(["a", "b"]):
+            cache.set(key, value)
+            os.utime(os.path.join(temp_dir, f"{key}.json"), (n, n))
+
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get("a") == value
+        cache.set("c", value)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == value
+        assert cache.get("c") == value
+
+
+def test_build_cache_clear():
+    """Test that clearing removes every entry"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = BuildCache(os.path.join(temp_dir, "cache"), 1 << 20)
+        cache.set("a", 1)
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert not os.path.exists(os.path.join(temp_dir, "cache"))
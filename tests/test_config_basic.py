@@ -41,3 +41,32 @@ def test_no_warning_with_multiple_locales():
     # Should have no errors or warnings
     assert len(errors) == 0
     assert len(warnings) == 0
+
+
+def test_invalid_search_segmenter_error():
+    """Test that error is shown when a segmenter is not a module:callable path"""
+    plugin_config = MaterialI18nPluginConfig()
+    plugin_config.load_dict(
+        {
+            "locales": [{"lang": "en"}, {"lang": "zh"}],
+            "search_segmenters": {"zh": "jieba"},
+        }
+    )
+    errors, warnings = plugin_config.validate()
+
+    assert len(errors) == 1
+    assert "must be given as 'module:callable'" in str(errors[0])
+
+
+def test_build_locales_environment_override(monkeypatch):
+    """Test that the environment variable overrides build_locales and is validated"""
+    monkeypatch.setenv("MKDOCS_I18N_BUILD_LOCALES", "zh, fr")
+    plugin_config = MaterialI18nPluginConfig()
+    plugin_config.load_dict(
+        {"locales": [{"lang": "en"}, {"lang": "zh"}], "build_locales": ["en"]}
+    )
+    errors, warnings = plugin_config.validate()
+
+    assert plugin_config.build_locales == ["zh", "fr"]
+    assert len(errors) == 1
+    assert "Locale 'fr' of build_locales" in str(errors[0])
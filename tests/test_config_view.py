@@ -0,0 +1,64 @@
+"""Tests for the read-through configuration view in MkDocs Material i18n Plugin"""
+
+import tracemalloc
+
+import pytest
+from mkdocs.config import load_config
+
+from mkdocs_material_i18n.config_view import ConfigView
+
+
+def test_config_view_overrides_keys():
+    """Test that overridden keys are read from the view and others from the config"""
+    config = load_config("tests/mkdocs.yml")
+    view = ConfigView(config, nav=["en/index.md"])
+
+    assert view["nav"] == ["en/index.md"]
+    assert view.nav == ["en/index.md"]
+    assert view["site_name"] == "Test Site"
+    assert view.site_name == "Test Site"
+    assert view.get("site_url") == config.get("site_url")
+    assert view.validation is config.validation
+    assert "nav" in view and "theme" in view
+    assert len(view) == len(config)
+
+    # The wrapped configuration is left untouched
+    assert config["nav"] is None
+
+
+def test_config_view_is_read_only():
+    """Test that the view cannot be modified"""
+    config = load_config("tests/mkdocs.yml")
+    view = ConfigView(config, nav=None)
+
+    with pytest.raises(AttributeError):
+        view.nav = ["en/index.md"]
+    with pytest.raises(TypeError):
+        view["nav"] = ["en/index.md"]
+
+
+def measure_peak_allocation(function) -> int:
+    """Helper function to measure the peak memory allocated by a call"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_config_view_allocation_benchmark():
+    """Benchmark allocations of a per-locale config view against config.copy()"""
+    config = load_config(
+        "tests/mkdocs.yml",
+        extra={f"key_{index}": {"value": "x" * 64} for index in range(2000)},
+    )
+    locales = 40
+
+    copy_peak = measure_peak_allocation(lambda: [config.copy() for _ in range(locales)])
+    view_peak = measure_peak_allocation(
+        lambda: [ConfigView(config, nav=None) for _ in range(locales)]
+    )
+
+    # A view only holds its overrides, a copy duplicates every top-level key
+    assert view_peak * 4 < copy_peak
@@ -351,3 +351,115 @@ def test_integration_full_workflow():
         assert "DEFAULT_LANGUAGE" in content
         assert "navigator.language" in content
         assert "window.location.href" in content
+
+
+def test_generate_default_index_html_remembers_language():
+    """Test that a language picked in the switcher is tried before browser languages"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+
+    generator = IndexPageManager([locale_en, locale_zh], locale_en, "cookie")
+    html_content = generator.generate_default_index_html()
+    assert "document.cookie.match" in html_content
+    assert "\n          return match ?" in html_content
+    assert "[remembered, ...userLangs]" in html_content
+    assert "document.cookie =" in generator.generate_remember_language_script()
+
+    generator = IndexPageManager([locale_en, locale_zh], locale_en, "local_storage")
+    html_content = generator.generate_default_index_html()
+    assert 'localStorage.getItem("i18n_lang")' in html_content
+    assert "localStorage.setItem" in generator.generate_remember_language_script()
+
+
+def test_generate_default_index_html_without_remembered_language():
+    """Test that nothing is stored or read unless configured"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    generator = IndexPageManager([locale_en], locale_en)
+
+    html_content = generator.generate_default_index_html()
+    assert "return null;" in html_content
+    assert "localStorage" not in html_content
+    assert 'rel="prefetch"' not in html_content
+    assert generator.generate_remember_language_script() is None
+
+
+def test_generate_default_index_html_with_prefetch():
+    """Test that the default locale home is prefetched if configured"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    generator = IndexPageManager([locale_en], locale_en, prefetch=True)
+
+    html_content = generator.generate_default_index_html()
+    assert '<link rel="prefetch" href="/en/" />' in html_content
+
+
+def test_create_index_file_renders_custom_template():
+    """Test that the custom index.html is rendered with the locales of the site"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(
+                "<script>const LANGUAGE_MAP = {{ language_map }};</script>\n"
+                '{% for locale in locales %}<a href="{{ locale.link }}">'
+                "{{ locale.name }}</a>{% endfor %}\n"
+                "<a href=\"{{ default_locale.link }}\">{{ languages['zh'] }}</a>\n"
+            )
+
+        config = Mock(spec=MkDocsConfig)
+        config.site_dir = temp_dir
+        config.theme = Mock()
+        config.theme.custom_dir = temp_dir
+
+        locale_en = create_test_locale("English", "/en/", "en")
+        locale_zh = create_test_locale("中文", "/zh/", "zh")
+        generator = IndexPageManager([locale_en, locale_zh], locale_en)
+
+        html_content = generator.render_custom_index(config)
+        assert '"zh": "/zh/"' in html_content
+        assert '<a href="/en/">English</a><a href="/zh/">中文</a>' in html_content
+        assert '<a href="/en/">/zh/</a>\n' in html_content
+
+
+def test_custom_index_template_is_cached_by_mtime():
+    """Test that the compiled template is reused until the file changes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        custom_index_path = os.path.join(temp_dir, "index.html")
+        with open(custom_index_path, "w", encoding="utf-8") as f:
+            f.write("{{ default_locale.lang }}")
+
+        config = Mock(spec=MkDocsConfig)
+        config.theme = Mock()
+        config.theme.custom_dir = temp_dir
+
+        locale_en = create_test_locale("English", "/en/", "en")
+        cache = {}
+        generator = IndexPageManager([locale_en], locale_en, template_cache=cache)
+        template = generator.get_compiled_index_template(config)
+        assert template.render(default_locale=locale_en) == "en"
+
+        # A new build sharing the cache does not read the file again
+        generator = IndexPageManager([locale_en], locale_en, template_cache=cache)
+        with patch.object(generator, "get_custom_index_template") as read:
+            assert generator.get_compiled_index_template(config) is template
+            read.assert_not_called()
+
+        with open(custom_index_path, "w", encoding="utf-8") as f:
+            f.write("{{ default_locale.name }}")
+        os.utime(custom_index_path, ns=(0, 0))
+        assert generator.render_custom_index(config) == "English"
+
+
+@patch("mkdocs_material_i18n.index.log")
+def test_custom_index_template_syntax_error(mock_log):
+    """Test that an invalid template is written as is"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write("<p>{% broken</p>")
+
+        config = Mock(spec=MkDocsConfig)
+        config.theme = Mock()
+        config.theme.custom_dir = temp_dir
+
+        locale_en = create_test_locale("English", "/en/", "en")
+        generator = IndexPageManager([locale_en], locale_en)
+
+        assert generator.render_custom_index(config) == "<p>{% broken</p>"
+        mock_log.warning.assert_called_once()
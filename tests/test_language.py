@@ -0,0 +1,135 @@
+"""Tests for language context functionality in MkDocs Material i18n Plugin"""
+
+from mkdocs.config import load_config
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.pages import Page
+
+from mkdocs_material_i18n.language import LanguageManager
+
+
+def create_test_manager(src_uris, alternate_fallback="home"):
+    """Helper function to create a language manager with an indexed file set"""
+    config = load_config("tests/mkdocs.yml")
+    plugin = config["plugins"]["i18n"]
+    plugin.on_config(config)
+    locale_mapper = plugin.get_build(config).locale_mapper
+
+    files = Files(
+        [
+            File(src_uri, config.docs_dir, config.site_dir, config.use_directory_urls)
+            for src_uri in src_uris
+        ]
+    )
+    locale_mapper.classify_files(files)
+
+    manager = LanguageManager(
+        plugin.config.locales,
+        locale_mapper,
+        plugin.config.default_locale,
+        alternate_fallback,
+    )
+    manager.build_counterpart_index(files)
+    manager.build_page_configs(files, config)
+    return manager, config, files
+
+
+def get_page_config(manager, config, files, src_uri):
+    """Helper function to get the config of a page's template context"""
+    page = Page(None, files.get_file_from_path(src_uri), config)
+    context = manager.modify_page_context({"config": config}, page, config)
+    return context["config"]
+
+
+def get_alternate_links(manager, config, files, src_uri):
+    """Helper function to get the alternate links of a page's template context"""
+    page_config = get_page_config(manager, config, files, src_uri)
+    return {alt["lang"]: alt["link"] for alt in page_config.extra["alternate"]}
+
+
+def test_counterpart_index():
+    """Test that every translated page is indexed by relative URL and language"""
+    manager, _, _ = create_test_manager(
+        ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide/index.md"]
+    )
+
+    assert manager.counterparts == {
+        ("", "en"): "/en/",
+        ("guide/", "en"): "/en/guide/",
+        ("", "zh"): "/zh/",
+        ("guide/", "zh"): "/zh/guide/",
+    }
+
+
+def test_alternate_links_to_existing_translations():
+    """Test that alternates link to the translation of the current page"""
+    manager, config, files = create_test_manager(
+        ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"]
+    )
+
+    assert get_alternate_links(manager, config, files, "zh/guide.md") == {
+        "en": "/en/guide/",
+        "zh": "/zh/guide/",
+    }
+    assert get_alternate_links(manager, config, files, "en/index.md") == {
+        "en": "/en/",
+        "zh": "/zh/",
+    }
+
+
+def test_alternate_links_fall_back_to_locale_home():
+    """Test that missing translations link to the home page of their locale"""
+    manager, config, files = create_test_manager(
+        ["en/index.md", "en/guide.md", "zh/index.md"]
+    )
+
+    assert get_alternate_links(manager, config, files, "en/guide.md") == {
+        "en": "/en/guide/",
+        "zh": "/zh/",
+    }
+
+
+def test_alternate_links_fall_back_to_default_locale():
+    """Test that missing translations can link to the default-locale page"""
+    manager, config, files = create_test_manager(
+        ["en/index.md", "en/guide.md", "zh/index.md", "zh/api.md"],
+        alternate_fallback="default",
+    )
+
+    # English is the default locale of the test site
+    assert get_alternate_links(manager, config, files, "zh/api.md") == {
+        "en": "/en/",
+        "zh": "/zh/api/",
+    }
+    assert manager.get_alternate_link("guide/", manager.locales[1]) == "/en/guide/"
+
+
+def test_page_context_leaves_config_untouched():
+    """Test that page language and site name only change the page's context"""
+    manager, config, files = create_test_manager(["en/index.md", "zh/index.md"])
+    manager.locales[1].site_name = "测试站点"
+    manager.build_page_configs(files, config)
+
+    zh_config = get_page_config(manager, config, files, "zh/index.md")
+    en_config = get_page_config(manager, config, files, "en/index.md")
+
+    assert zh_config.theme["language"] == "zh"
+    assert zh_config.site_name == "测试站点"
+    assert en_config.theme["language"] == "en"
+    assert en_config.site_name == "Test Site"
+    # Other settings are read through to the shared config
+    assert zh_config.theme["font"] == config.theme["font"]
+    assert zh_config.plugins is config.plugins
+
+    assert config.theme["language"] == "en"
+    assert config.site_name == "Test Site"
+    assert [alt["link"] for alt in config.extra["alternate"]] == ["/en/", "/zh/"]
+
+
+def test_pages_with_same_relative_url_share_alternates():
+    """Test that translations of a page share one precomputed alternate list"""
+    manager, config, files = create_test_manager(["en/guide.md", "zh/guide.md"])
+
+    en_config = get_page_config(manager, config, files, "en/guide.md")
+    zh_config = get_page_config(manager, config, files, "zh/guide.md")
+
+    assert en_config.extra["alternate"] is zh_config.extra["alternate"]
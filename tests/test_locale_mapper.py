@@ -0,0 +1,172 @@
+"""Tests for locale mapping functionality in MkDocs Material i18n Plugin"""
+
+import os
+
+from mkdocs.structure.files import File, Files
+
+from mkdocs_material_i18n.config import LocaleConfig
+from mkdocs_material_i18n.locale_mapper import LocaleMapper
+
+
+def create_test_locale(name: str, link: str, lang: str) -> LocaleConfig:
+    """Helper function to create a test locale configuration"""
+    locale = LocaleConfig()
+    locale.load_dict({"name": name, "link": link, "lang": lang})
+    return locale
+
+
+def create_test_file(src_uri: str) -> File:
+    """Helper function to create a test documentation file"""
+    return File(src_uri, "docs", "site", use_directory_urls=True)
+
+
+def create_test_mapper(*locales: LocaleConfig) -> LocaleMapper:
+    """Helper function to create an initialized locale mapper"""
+    mapper = LocaleMapper()
+    mapper.initialize(list(locales))
+    return mapper
+
+
+def test_detect_locale_single_segment_link():
+    """Test that the first directory of a path is matched against single segment links"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = create_test_mapper(locale_en, locale_zh)
+
+    assert mapper.detect_locale_from_path("en/index.md") is locale_en
+    assert mapper.detect_locale_from_path("zh/guide/setup.md") is locale_zh
+    assert mapper.detect_lang_from_path("zh/guide/setup.md") == "zh"
+
+
+def test_detect_locale_unmatched_paths():
+    """Test that paths outside of any locale link are not matched"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    mapper = create_test_mapper(locale_en)
+
+    assert mapper.detect_locale_from_path("index.md") is None
+    assert mapper.detect_locale_from_path("fr/index.md") is None
+    assert mapper.detect_locale_from_path("assets/en/logo.png") is None
+    # A file named like a link directory is not a directory
+    assert mapper.detect_locale_from_path("en") is None
+
+
+def test_detect_locale_multi_segment_link():
+    """Test that multi-segment links such as /docs/en/ are matched"""
+    locale_en = create_test_locale("English", "/docs/en/", "en")
+    locale_zh = create_test_locale("中文", "/docs/zh/", "zh")
+    mapper = create_test_mapper(locale_en, locale_zh)
+
+    assert mapper.detect_locale_from_path("docs/en/index.md") is locale_en
+    assert mapper.detect_locale_from_path("docs/zh/guide/index.md") is locale_zh
+    assert mapper.detect_locale_from_path("docs/index.md") is None
+    assert mapper.get_locale_by_link_dir("docs/en") is locale_en
+
+
+def test_detect_locale_longest_prefix_wins():
+    """Test that the longest matching link wins over a shorter one"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_en_gb = create_test_locale("English (UK)", "/en/gb/", "en-GB")
+    mapper = create_test_mapper(locale_en, locale_en_gb)
+
+    assert mapper.detect_locale_from_path("en/index.md") is locale_en
+    assert mapper.detect_locale_from_path("en/gb/index.md") is locale_en_gb
+    assert mapper.detect_locale_from_path("en/guide/index.md") is locale_en
+
+
+def test_detect_locale_cache_counters():
+    """Test that repeated lookups are served from the per-path cache"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    mapper = create_test_mapper(locale_en)
+
+    mapper.detect_locale_from_path("en/index.md")
+    mapper.detect_locale_from_path("en/index.md")
+    mapper.detect_lang_from_path("en/index.md")
+    mapper.detect_locale_from_path("index.md")
+
+    assert mapper.cache_info() == {"hits": 2, "misses": 2, "size": 2}
+
+
+def test_initialize_resets_cache():
+    """Test that re-initializing the mapper drops stale lookups"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_fr = create_test_locale("Français", "/en/", "fr")
+    mapper = create_test_mapper(locale_en)
+
+    assert mapper.detect_lang_from_path("en/index.md") == "en"
+
+    mapper.initialize([locale_fr])
+
+    assert mapper.cache_info() == {"hits": 0, "misses": 0, "size": 0}
+    assert mapper.detect_lang_from_path("en/index.md") == "fr"
+
+
+def test_classify_files():
+    """Test that files are classified once and then served from the side table"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = create_test_mapper(locale_en, locale_zh)
+
+    file_en = create_test_file("en/index.md")
+    file_zh = create_test_file("zh/guide.md")
+    file_root = create_test_file("index.md")
+    mapper.classify_files(Files([file_en, file_zh, file_root]))
+
+    assert mapper.file2locale == {
+        "en/index.md": locale_en,
+        "zh/guide.md": locale_zh,
+        "index.md": None,
+    }
+
+    misses = mapper.cache_misses
+    assert mapper.get_locale_by_file(file_en) is locale_en
+    assert mapper.get_locale_by_file(file_zh) is locale_zh
+    assert mapper.get_locale_by_file(file_root) is None
+    # No path resolution happens for classified files
+    assert mapper.cache_misses == misses
+    assert mapper.cache_hits == 0
+
+
+def test_get_locale_by_unclassified_file():
+    """Test that files added after classification fall back to path detection"""
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = create_test_mapper(locale_zh)
+    mapper.classify_files(Files([]))
+
+    assert mapper.get_locale_by_file(create_test_file("zh/new.md")) is locale_zh
+
+
+def test_root_locale_urls():
+    """Test that URLs outside of other locales belong to the root locale"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = LocaleMapper()
+    mapper.initialize([locale_en, locale_zh], locale_en)
+
+    assert mapper.get_url(locale_en) == "/"
+    assert mapper.get_url(locale_zh) == "/zh/"
+    assert mapper.detect_locale_from_url("guide/") is locale_en
+    assert mapper.detect_locale_from_url("zh/guide/") is locale_zh
+    # Source paths keep the link directory of the root locale
+    assert mapper.detect_locale_from_path("guide.md") is None
+
+
+def test_move_root_locale_files():
+    """Test that root locale files move to the site root and replace clashing files"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = LocaleMapper()
+    mapper.initialize([locale_en, locale_zh], locale_en)
+
+    file_en = create_test_file("en/guide.md")
+    file_zh = create_test_file("zh/guide.md")
+    file_root = create_test_file("guide.md")
+    assert file_en.url == "en/guide/"
+
+    files = Files([file_en, file_zh, file_root])
+    mapper.classify_files(files)
+
+    assert mapper.move_root_locale_files(files) == 1
+    assert file_en.url == "guide/"
+    assert file_en.abs_dest_path == os.path.normpath("site/guide/index.html")
+    assert file_zh.url == "zh/guide/"
+    assert list(files) == [file_en, file_zh]
@@ -0,0 +1,210 @@
+"""Tests for navigation management functionality in MkDocs Material i18n Plugin"""
+
+import tempfile
+from unittest.mock import patch
+
+from mkdocs.config import load_config
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.nav import get_navigation
+
+from mkdocs_material_i18n.cache import BuildCache
+from mkdocs_material_i18n.navigation import NavigationManager
+
+
+def create_test_config():
+    """Helper function to load the test site configuration"""
+    config = load_config("tests/mkdocs.yml")
+    plugin = config["plugins"]["i18n"]
+    plugin.on_config(config)
+    return config, plugin.config.locales, plugin.get_build(config).locale_mapper
+
+
+def create_test_files(config, locale_mapper, src_uris):
+    """Helper function to create the files and global navigation of a build"""
+    files = Files(
+        [
+            File(src_uri, config.docs_dir, config.site_dir, config.use_directory_urls)
+            for src_uri in src_uris
+        ]
+    )
+    locale_mapper.classify_files(files)
+    nav = get_navigation(files, config)
+    return files, nav
+
+
+def build_navigations(manager, config, files, nav):
+    """Helper function to run the navigation build of the on_files and on_nav events"""
+    manager.build_language_files(files)
+    manager.build_language_navigations(nav, files, config)
+
+
+def test_build_language_navigations():
+    """Test that every language gets a navigation of its own pages"""
+    config, locales, mapper = create_test_config()
+    files, nav = create_test_files(
+        config, mapper, ["en/index.md", "en/guide.md", "zh/index.md"]
+    )
+
+    manager = NavigationManager(locales, mapper)
+    build_navigations(manager, config, files, nav)
+
+    assert [page.file.src_uri for page in manager.language_navs["en"].pages] == [
+        "en/index.md",
+        "en/guide.md",
+    ]
+    assert [page.file.src_uri for page in manager.language_navs["zh"].pages] == [
+        "zh/index.md"
+    ]
+
+
+def test_unchanged_navigations_are_reused():
+    """Test that a rebuild with the same files reuses the cached navigations"""
+    config, locales, mapper = create_test_config()
+    src_uris = ["en/index.md", "en/guide.md", "zh/index.md"]
+    nav_cache = {}
+
+    files, nav = create_test_files(config, mapper, src_uris)
+    build_navigations(NavigationManager(locales, mapper, nav_cache), config, files, nav)
+
+    # Simulate a serve rebuild, which creates new File and Page objects
+    files, nav = create_test_files(config, mapper, src_uris)
+    manager = NavigationManager(locales, mapper, nav_cache)
+    with patch("mkdocs_material_i18n.navigation.get_navigation") as mock_get_nav:
+        build_navigations(manager, config, files, nav)
+        mock_get_nav.assert_not_called()
+
+    en_pages = manager.language_navs["en"].pages
+    assert en_pages == [
+        files.get_file_from_path("en/index.md").page,
+        files.get_file_from_path("en/guide.md").page,
+    ]
+    assert all(
+        page is files.get_file_from_path(page.file.src_uri).page for page in en_pages
+    )
+    assert en_pages[0].next_page is en_pages[1]
+    assert en_pages[1].previous_page is en_pages[0]
+
+
+def test_changed_navigation_is_rebuilt():
+    """Test that only languages whose file set changed get a new navigation"""
+    config, locales, mapper = create_test_config()
+    nav_cache = {}
+
+    files, nav = create_test_files(config, mapper, ["en/index.md", "zh/index.md"])
+    build_navigations(NavigationManager(locales, mapper, nav_cache), config, files, nav)
+
+    files, nav = create_test_files(
+        config, mapper, ["en/index.md", "zh/index.md", "zh/guide.md"]
+    )
+    manager = NavigationManager(locales, mapper, nav_cache)
+    with patch(
+        "mkdocs_material_i18n.navigation.get_navigation", wraps=get_navigation
+    ) as mock_get_nav:
+        build_navigations(manager, config, files, nav)
+        assert mock_get_nav.call_count == 1
+
+    assert [page.file.src_uri for page in manager.language_navs["zh"].pages] == [
+        "zh/index.md",
+        "zh/guide.md",
+    ]
+
+
+def test_navigations_are_restored_from_build_cache():
+    """Test that a cold build restores navigations from the on-disk cache"""
+    config, locales, mapper = create_test_config()
+    src_uris = ["en/index.md", "en/guide.md", "zh/index.md"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files, nav = create_test_files(config, mapper, src_uris)
+        manager = NavigationManager(
+            locales, mapper, build_cache=BuildCache(temp_dir, 1 << 20)
+        )
+        build_navigations(manager, config, files, nav)
+        expected = [page.file.src_uri for page in manager.language_navs["en"].pages]
+
+        # A new process starts without navigations in memory
+        files, nav = create_test_files(config, mapper, src_uris)
+        build_cache = BuildCache(temp_dir, 1 << 20)
+        manager = NavigationManager(locales, mapper, build_cache=build_cache)
+        with patch("mkdocs_material_i18n.navigation.get_navigation") as mock_get_nav:
+            build_navigations(manager, config, files, nav)
+            mock_get_nav.assert_not_called()
+
+        assert build_cache.hits == len(locales)
+        en_pages = manager.language_navs["en"].pages
+        assert [page.file.src_uri for page in en_pages] == expected
+        assert en_pages[0] is files.get_file_from_path("en/index.md").page
+        assert en_pages[0].next_page is en_pages[1]
+
+
+def test_derived_navigations_share_global_pages():
+    """Test that derived navigations re-root the global navigation per language"""
+    config, locales, mapper = create_test_config()
+    files, nav = create_test_files(
+        config, mapper, ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"]
+    )
+
+    manager = NavigationManager(locales, mapper, derive_nav=True)
+    with patch("mkdocs_material_i18n.navigation.get_navigation") as mock_get_nav:
+        build_navigations(manager, config, files, nav)
+        mock_get_nav.assert_not_called()
+
+    en_nav = manager.language_navs["en"]
+    en_pages = [
+        files.get_file_from_path("en/index.md").page,
+        files.get_file_from_path("en/guide.md").page,
+    ]
+    # The language section of the auto-generated global nav is removed
+    assert en_nav.items == en_pages
+    assert en_nav.pages == en_pages
+    assert all(page.parent is None for page in en_pages)
+
+    # Previous and next links do not cross into other languages
+    assert en_pages[0].previous_page is None
+    assert en_pages[1].next_page is None
+
+
+def test_derived_navigations_keep_nested_sections():
+    """Test that sections below the language directory are kept"""
+    config, locales, mapper = create_test_config()
+    files, nav = create_test_files(
+        config, mapper, ["en/index.md", "en/guide/setup.md", "zh/index.md"]
+    )
+
+    manager = NavigationManager(locales, mapper, derive_nav=True)
+    build_navigations(manager, config, files, nav)
+
+    en_nav = manager.language_navs["en"]
+    index_page, section = en_nav.items
+    assert index_page is files.get_file_from_path("en/index.md").page
+    assert section.is_section
+    assert section.children == [files.get_file_from_path("en/guide/setup.md").page]
+    assert section.children[0].parent is section
+    assert index_page.next_page is section.children[0]
+
+
+def test_lazy_navigations_are_built_on_first_use():
+    """Test that lazy navigations are only built for languages whose pages are rendered"""
+    config, locales, mapper = create_test_config()
+    files, nav = create_test_files(
+        config, mapper, ["en/index.md", "en/guide/setup.md", "zh/index.md"]
+    )
+
+    nav_cache = {}
+    manager = NavigationManager(locales, mapper, nav_cache, lazy=True)
+    build_navigations(manager, config, files, nav)
+    assert manager.language_navs == {}
+
+    # MkDocs activates the page before its navigation is built
+    setup_page = files.get_file_from_path("en/guide/setup.md").page
+    setup_page.active = True
+    context = manager.modify_navigation_context({}, setup_page)
+    assert list(manager.language_navs) == ["en"]
+    assert context["nav"] is manager.language_navs["en"]
+    assert setup_page.ancestors[-1] in context["nav"].items
+    assert setup_page.parent.active
+
+    # Later pages of the language reuse its navigation
+    index_page = files.get_file_from_path("en/index.md").page
+    assert manager.modify_navigation_context({}, index_page)["nav"] is context["nav"]
+    assert list(nav_cache) == ["en"]
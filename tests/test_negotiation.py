@@ -0,0 +1,71 @@
+"""Tests for BCP-47 language negotiation in MkDocs Material i18n Plugin"""
+
+from mkdocs_material_i18n.config import LocaleConfig
+from mkdocs_material_i18n.negotiation import LanguageNegotiator, parse_tag, truncate_tag
+
+
+def create_test_locale(name: str, link: str, lang: str) -> LocaleConfig:
+    """Helper function to create a test locale configuration"""
+    locale = LocaleConfig()
+    locale.load_dict({"name": name, "link": link, "lang": lang})
+    return locale
+
+
+def create_test_negotiator() -> LanguageNegotiator:
+    """Helper function to create a negotiator for English, Chinese and Hebrew"""
+    return LanguageNegotiator(
+        [
+            create_test_locale("English", "/en/", "en"),
+            create_test_locale("繁體中文", "/zh-tw/", "zh-TW"),
+            create_test_locale("简体中文", "/zh-cn/", "zh-CN"),
+            create_test_locale("עברית", "/he/", "he"),
+        ]
+    )
+
+
+def test_parse_tag():
+    """Test that language, script and region subtags are recognized"""
+    assert parse_tag("zh-Hant-TW") == ("zh", "hant", "tw")
+    assert parse_tag("en_US") == ("en", None, "us")
+    assert parse_tag("es-419") == ("es", None, "419")
+    assert parse_tag("sr-Latn") == ("sr", "latn", None)
+
+
+def test_truncate_tag():
+    """Test that subtags are dropped one at a time, along with singletons"""
+    assert truncate_tag("zh-hant-tw") == "zh-hant"
+    assert truncate_tag("zh-hant") == "zh"
+    assert truncate_tag("zh") == ""
+    assert truncate_tag("en-a-bbb") == "en"
+
+
+def test_expand_tag():
+    """Test that a tag is expanded into equivalent forms, its script and its language"""
+    equivalent, implied, language = create_test_negotiator().expand_tag("zh-TW")
+
+    assert equivalent == ["zh-tw", "zh-hant-tw"]
+    assert implied == ["zh-hant", "zh-hk", "zh-hant-hk", "zh-mo", "zh-hant-mo"]
+    assert language == ["zh"]
+
+
+def test_build_match_table_prefers_closer_matches():
+    """Test that region and script fallbacks resolve to the right locale"""
+    table = create_test_negotiator().build_match_table()
+
+    assert table["zh-hant-hk"] == "/zh-tw/"
+    assert table["zh-sg"] == "/zh-cn/"
+    assert table["zh-hans"] == "/zh-cn/"
+    assert table["iw"] == "/he/"
+    # The bare language goes to the first locale using it
+    assert table["zh"] == "/zh-tw/"
+
+
+def test_negotiate_accept_language():
+    """Test that Accept-Language preferences are walked by quality"""
+    negotiator = create_test_negotiator()
+    table = negotiator.build_match_table()
+
+    assert negotiator.negotiate(table, "zh-Hant-HK,en;q=0.5", "/en/") == "/zh-tw/"
+    assert negotiator.negotiate(table, "fr;q=0.9,zh-SG;q=0.8", "/en/") == "/zh-cn/"
+    assert negotiator.negotiate(table, "en;q=0.1,iw-IL", "/en/") == "/he/"
+    assert negotiator.negotiate(table, "de, *;q=0.5", "/en/") == "/en/"
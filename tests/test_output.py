@@ -0,0 +1,64 @@
+"""Tests for writing generated files in MkDocs Material i18n Plugin"""
+
+import os
+import tempfile
+
+import pytest
+
+from mkdocs_material_i18n.output import atomic_open, write_file
+
+
+def test_write_file_skips_unchanged_content():
+    """Test that files are only replaced when their content changes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "index.html")
+
+        assert write_file(path, "<p>Hello</p>") is True
+        os.utime(path, ns=(0, 0))
+
+        assert write_file(path, "<p>Hello</p>") is False
+        assert os.stat(path).st_mtime_ns == 0
+
+        assert write_file(path, "<p>Bonjour</p>") is True
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "<p>Bonjour</p>"
+        assert os.listdir(temp_dir) == ["index.html"]
+
+
+def test_write_file_keeps_permissions():
+    """Test that replaced files keep the permissions of the file they replace"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, ".htaccess")
+        write_file(path, "RewriteEngine On\n")
+        os.chmod(path, 0o640)
+
+        write_file(path, "RewriteEngine Off\n")
+        assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_write_file_creates_files_like_open():
+    """Test that new files get the permissions open() gives them under the umask"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        reference = os.path.join(temp_dir, "reference")
+        with open(reference, "w", encoding="utf-8"):
+            pass
+
+        path = os.path.join(temp_dir, "_redirects")
+        write_file(path, "/  /en/  302\n")
+        assert os.stat(path).st_mode & 0o777 == os.stat(reference).st_mode & 0o777
+
+
+def test_atomic_open_leaves_target_on_error():
+    """Test that a failed write neither touches the target nor leaves temporary files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "sitemap.xml")
+        write_file(path, "complete")
+
+        with pytest.raises(RuntimeError):
+            with atomic_open(path) as f:
+                f.write("partial")
+                raise RuntimeError("interrupted")
+
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "complete"
+        assert os.listdir(temp_dir) == ["sitemap.xml"]
@@ -0,0 +1,339 @@
+"""Tests for full builds with MkDocs Material i18n Plugin"""
+
+import gc
+import json
+import os
+import tempfile
+import threading
+
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+from mkdocs_material_i18n.plugin import _serve_states
+
+
+def create_test_site(root: str, src_uris) -> str:
+    """Helper function to create a docs directory with the given pages"""
+    docs_dir = os.path.join(root, "docs")
+    for src_uri in src_uris:
+        path = os.path.join(docs_dir, src_uri)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {src_uri}\n")
+    return docs_dir
+
+
+def read_site_file(config, path: str) -> str:
+    """Helper function to read a file of a built site"""
+    with open(os.path.join(config.site_dir, path), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_concurrent_builds_do_not_share_state():
+    """Test that two sites built at the same time on threads stay independent"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sites = {
+            "full": (
+                ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"],
+                ["en", "zh"],
+            ),
+            "partial": (
+                ["en/index.md", "en/guide.md", "fr/index.md", "de/index.md"],
+                ["en", "fr", "de"],
+            ),
+        }
+        # Both configs are loaded before either is built
+        configs = {}
+        for name, (src_uris, langs) in sites.items():
+            root = os.path.join(temp_dir, name)
+            configs[name] = load_config(
+                "tests/mkdocs.yml",
+                site_name=f"Site {name}",
+                docs_dir=create_test_site(root, src_uris),
+                site_dir=os.path.join(root, "site"),
+                plugins=[
+                    {
+                        "i18n": {
+                            "locales": [
+                                {"name": lang, "link": f"/{lang}/", "lang": lang}
+                                for lang in langs
+                            ]
+                        }
+                    }
+                ],
+            )
+        assert (
+            configs["full"]["plugins"]["i18n"]
+            is not configs["partial"]["plugins"]["i18n"]
+        )
+
+        barrier = threading.Barrier(len(configs))
+        errors = []
+
+        def run_build(config):
+            try:
+                barrier.wait()
+                build(config)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=run_build, args=(config,))
+            for config in configs.values()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+        full_guide = read_site_file(configs["full"], "en/guide/index.html")
+        partial_guide = read_site_file(configs["partial"], "en/guide/index.html")
+
+        # Each build links to its own locales and translations only
+        assert 'href="/zh/guide/" hreflang="zh"' in full_guide
+        assert 'hreflang="fr"' not in full_guide
+        assert 'href="/fr/" hreflang="fr"' in partial_guide
+        assert 'href="/de/" hreflang="de"' in partial_guide
+        assert 'hreflang="zh"' not in partial_guide
+        assert "Site full" in full_guide
+        assert "Site partial" in partial_guide
+
+        assert '"zh": "/zh/"' in read_site_file(configs["full"], "index.html")
+        partial_home = read_site_file(configs["partial"], "index.html")
+        assert '"de": "/de/"' in partial_home and '"zh"' not in partial_home
+
+        # Finished builds do not leave state behind on the plugin
+        for config in configs.values():
+            assert config["plugins"]["i18n"].get_build(config) is None
+
+
+def test_failed_builds_do_not_leave_state_behind():
+    """Test that the state of a build is dropped when the build fails"""
+    config = load_config("tests/mkdocs.yml")
+    plugin = config["plugins"]["i18n"]
+    config = config.plugins.on_config(config)
+    assert plugin.get_build(config) is not None
+
+    config.plugins.on_build_error(error=RuntimeError("Build failed"))
+    assert plugin.get_build(config) is None
+
+
+def test_search_index_is_sharded_by_locale():
+    """Test that every locale gets a search index of its own pages"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = load_config(
+            "tests/mkdocs.yml",
+            docs_dir=create_test_site(
+                temp_dir, ["en/index.md", "en/guide.md", "zh/index.md"]
+            ),
+            site_dir=os.path.join(temp_dir, "site"),
+            site_url="https://example.com/docs/",
+            plugins=[
+                "search",
+                {
+                    "i18n": {
+                        "search_shards": True,
+                        "locales": [
+                            {"name": "English", "link": "/en/", "lang": "en"},
+                            {"name": "中文", "link": "/zh/", "lang": "zh"},
+                        ],
+                    }
+                },
+            ],
+        )
+        build(config)
+
+        shard = json.loads(read_site_file(config, "en/search/search_index.json"))
+        locations = [doc["location"] for doc in shard["docs"]]
+        assert "en/" in locations
+        assert "en/guide/" in locations
+        assert not any(location.startswith("zh/") for location in locations)
+
+        shard = json.loads(read_site_file(config, "zh/search/search_index.json"))
+        assert [doc["location"] for doc in shard["docs"]] == ["zh/"]
+
+        # Search of locale pages loads the locale shard, the base is unchanged
+        guide = read_site_file(config, "en/guide/index.html")
+        assert '"en/search/search_index."' in guide
+        assert '"base": "../.."' in guide
+
+
+def test_remembered_language_script_is_loaded():
+    """Test that pages load the script saving the language picked in the switcher"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = load_config(
+            "tests/mkdocs.yml",
+            docs_dir=create_test_site(temp_dir, ["en/index.md", "zh/index.md"]),
+            site_dir=os.path.join(temp_dir, "site"),
+            plugins=[
+                {
+                    "i18n": {
+                        "remember_language": "local_storage",
+                        "locales": [
+                            {"name": "English", "link": "/en/", "lang": "en"},
+                            {"name": "中文", "link": "/zh/", "lang": "zh"},
+                        ],
+                    }
+                },
+            ],
+        )
+        build(config)
+
+        script = read_site_file(config, "assets/javascripts/i18n-language.js")
+        assert "localStorage.setItem" in script
+        assert "assets/javascripts/i18n-language.js" in read_site_file(
+            config, "zh/index.html"
+        )
+        assert "localStorage.getItem" in read_site_file(config, "index.html")
+
+
+def test_default_locale_at_root():
+    """Test that the default locale is built at the site root without a redirect page"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = load_config(
+            "tests/mkdocs.yml",
+            docs_dir=create_test_site(
+                temp_dir, ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"]
+            ),
+            site_dir=os.path.join(temp_dir, "site"),
+            plugins=[
+                "search",
+                {
+                    "i18n": {
+                        "default_locale_at_root": True,
+                        "search_shards": True,
+                        "locales": [
+                            {"name": "English", "link": "/en/", "lang": "en"},
+                            {"name": "中文", "link": "/zh/", "lang": "zh"},
+                        ],
+                    }
+                },
+            ],
+        )
+        build(config)
+
+        assert not os.path.exists(os.path.join(config.site_dir, "en"))
+        home = read_site_file(config, "index.html")
+        assert "LANGUAGE_MAP" not in home
+        assert 'href="/zh/" hreflang="zh"' in home
+
+        zh_guide = read_site_file(config, "zh/guide/index.html")
+        assert 'href="/guide/" hreflang="en"' in zh_guide
+        assert 'href="/zh/guide/" hreflang="zh"' in zh_guide
+
+        # The search index at the root only holds the default locale
+        shard = json.loads(read_site_file(config, "search/search_index.json"))
+        assert [doc["location"] for doc in shard["docs"]] == ["", "guide/"]
+        shard = json.loads(read_site_file(config, "zh/search/search_index.json"))
+        assert [doc["location"] for doc in shard["docs"]] == ["zh/", "zh/guide/"]
+
+
+def test_build_locales_links_other_locales_to_production():
+    """Test that only selected locales are built and others link to production"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = load_config(
+            "tests/mkdocs.yml",
+            docs_dir=create_test_site(
+                temp_dir, ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"]
+            ),
+            site_dir=os.path.join(temp_dir, "site"),
+            site_url="https://example.com/docs/",
+            plugins=[
+                {
+                    "i18n": {
+                        "build_locales": ["zh"],
+                        "locales": [
+                            {"name": "English", "link": "/en/", "lang": "en"},
+                            {"name": "中文", "link": "/zh/", "lang": "zh"},
+                        ],
+                    }
+                },
+            ],
+        )
+        build(config)
+
+        assert not os.path.exists(os.path.join(config.site_dir, "en"))
+        zh_guide = read_site_file(config, "zh/guide/index.html")
+        assert 'href="https://example.com/docs/en/guide/" hreflang="en"' in zh_guide
+        assert 'href="/zh/guide/" hreflang="zh"' in zh_guide
+
+        home = read_site_file(config, "index.html")
+        assert '"en": "https://example.com/docs/en/"' in home
+        assert '"zh": "/zh/"' in home
+
+
+def test_dirty_locales_reuse_unchanged_pages(caplog):
+    """Test that serve rebuilds only render the locales whose sources changed"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docs_dir = create_test_site(
+            temp_dir, ["en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"]
+        )
+
+        def load_serve_config():
+            return load_config(
+                "tests/mkdocs.yml",
+                docs_dir=docs_dir,
+                site_dir=os.path.join(temp_dir, "site"),
+                plugins=[
+                    {
+                        "i18n": {
+                            "dirty_locales": True,
+                            "locales": [
+                                {"name": "English", "link": "/en/", "lang": "en"},
+                                {"name": "中文", "link": "/zh/", "lang": "zh"},
+                            ],
+                        }
+                    },
+                ],
+            )
+
+        with open(os.path.join(docs_dir, "en", "guide.md"), "w") as f:
+            f.write("# Guide\n\n## Setup\n")
+
+        # Serve starts watching the site after its first build, and keeps the
+        # config it started with for the whole session
+        serve_config = load_serve_config()
+        build(serve_config)
+        serve_config.plugins.on_serve(object(), config=serve_config, builder=build)
+        en_guide = read_site_file(serve_config, "en/guide/index.html")
+
+        # Serve reloads the config for every rebuild, the site state is kept
+        path = os.path.join(docs_dir, "zh", "guide.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Changed guide\n\n[Guide](../en/guide.md#setup)\n")
+        os.utime(path, ns=(0, 0))
+        config = load_serve_config()
+        with caplog.at_level("INFO"):
+            build(config)
+
+        assert "Reused 2 pages of unchanged locales: en" in caplog.text
+        assert read_site_file(config, "en/guide/index.html") == en_guide
+        zh_guide = read_site_file(config, "zh/guide/index.html")
+        assert "Changed guide" in zh_guide
+
+        # Links to reused pages still resolve, anchors included
+        assert 'href="../../en/guide/#setup"' in zh_guide
+        assert "en/guide.md" not in caplog.text
+
+        # The state of the site goes away with the serve session
+        del serve_config
+        gc.collect()
+        assert config.site_dir not in _serve_states
+
+
+def test_builds_do_not_keep_navigations():
+    """Test that builds outside of serve sessions keep no pages once done"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = load_config(
+            "tests/mkdocs.yml",
+            docs_dir=create_test_site(temp_dir, ["en/index.md", "zh/index.md"]),
+            site_dir=os.path.join(temp_dir, "site"),
+        )
+        build(config)
+
+        site_state = config.plugins["i18n"].site_state
+        assert site_state.nav_cache == {}
+        assert not site_state.serving
+        assert config.site_dir not in _serve_states
@@ -0,0 +1,199 @@
+"""Tests for server-side redirect rules in MkDocs Material i18n Plugin"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+from mkdocs_material_i18n.config import LocaleConfig
+from mkdocs_material_i18n.index import IndexPageManager
+from mkdocs_material_i18n.locale_mapper import LocaleMapper
+from mkdocs_material_i18n.redirects import RedirectRulesManager, RedirectStubManager
+
+
+def create_test_locale(name: str, link: str, lang: str) -> LocaleConfig:
+    """Helper function to create a test locale configuration"""
+    locale = LocaleConfig()
+    locale.load_dict({"name": name, "link": link, "lang": lang})
+    return locale
+
+
+def create_test_manager() -> RedirectRulesManager:
+    """Helper function to create a redirect rules generator from a language map"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh_tw = create_test_locale("繁體中文", "/zh-tw/", "zh-TW")
+    index_generator = IndexPageManager([locale_en, locale_zh_tw], locale_en)
+    return RedirectRulesManager(index_generator.build_language_map(), locale_en.link)
+
+
+def test_ordered_rules_test_subtags_first():
+    """Test that region-specific codes are matched before their base language"""
+    rules = create_test_manager().get_ordered_rules()
+    lang_codes = [lang_code for lang_code, _ in rules]
+
+    assert lang_codes[0] == "zh-hant-tw"
+    assert lang_codes.index("zh-tw") < lang_codes.index("zh")
+    assert lang_codes[-2:] == ["en", "zh"]
+    assert dict(rules)["zh"] == "/zh-tw/"
+
+
+def test_generate_nginx_rules():
+    """Test that nginx rules map Accept-Language to locale links"""
+    rules = create_test_manager().generate_nginx_rules()
+
+    assert "map $http_accept_language $i18n_locale {" in rules
+    assert "    default /en/;" in rules
+    assert "    ~*^zh\\-tw\\b /zh-tw/;" in rules
+
+
+def test_generate_apache_rules():
+    """Test that Apache rules redirect the root and fall back to the default locale"""
+    rules = create_test_manager().generate_apache_rules().splitlines()
+
+    assert rules[0] == "RewriteEngine On"
+    assert rules[1] == "RewriteCond %{HTTP:Accept-Language} ^zh\\-hant\\-tw\\b [NC]"
+    assert rules[2] == "RewriteRule ^$ /zh-tw/ [R=302,L]"
+    assert rules[-1] == "RewriteRule ^$ /en/ [R=302,L]"
+
+
+def test_generate_netlify_rules():
+    """Test that Netlify rules use language conditions and shadow the root index.html"""
+    rules = create_test_manager().generate_netlify_rules().splitlines()
+
+    assert "/  /zh-tw/  302!  Language=zh-tw" in rules
+    assert rules[-3:] == [
+        "/  /en/  302!  Language=en",
+        "/  /zh-tw/  302!  Language=zh",
+        "/  /en/  302!",
+    ]
+
+
+def test_write_redirect_rules_keeps_existing_rules():
+    """Test that existing rules are kept and rules of previous builds replaced"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_dir=temp_dir)
+        path = os.path.join(temp_dir, "_redirects")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("/old  /en/guide/  301\n")
+
+        manager = create_test_manager()
+        manager.write_redirect_rules(config, ["netlify"])
+        manager.write_redirect_rules(config, ["netlify"])
+
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+
+        assert content.count("# BEGIN mkdocs-material-i18n") == 1
+        assert content.endswith("# END mkdocs-material-i18n\n/old  /en/guide/  301\n")
+
+
+def create_test_stub_manager() -> RedirectStubManager:
+    """Helper function to create a redirect stub generator for English and Chinese"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    mapper = LocaleMapper()
+    mapper.initialize([locale_en, locale_zh])
+    return RedirectStubManager([locale_en, locale_zh], mapper, locale_en)
+
+
+STUB_COUNTERPARTS = {
+    ("", "en"): "/en/",
+    ("guide/", "en"): "/en/guide/",
+    ("guide/", "zh"): "/zh/guide/",
+    ("api/", "zh"): "/zh/api/",
+}
+
+
+def test_write_redirect_stubs():
+    """Test that every translated path gets a stub using the shared script"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_dir=temp_dir, use_directory_urls=True)
+        manager = create_test_stub_manager()
+
+        assert manager.write_redirect_stubs(config, STUB_COUNTERPARTS) == 2
+
+        scripts = [name for name in os.listdir(temp_dir) if name.endswith(".js")]
+        assert len(scripts) == 1
+        assert scripts[0].startswith("i18n-redirect.")
+
+        with open(os.path.join(temp_dir, "guide", "index.html"), encoding="utf-8") as f:
+            stub = f.read()
+        assert f'src="../{scripts[0]}"' in stub
+        assert 'data-links="/en/ /zh/"' in stub
+        assert 'content="0;url=../en/guide/"' in stub
+        assert len(stub.encode("utf-8")) < 300
+
+        with open(os.path.join(temp_dir, "api", "index.html"), encoding="utf-8") as f:
+            assert 'content="0;url=../zh/api/"' in f.read()
+
+        # The root is left to the index page
+        assert not os.path.exists(os.path.join(temp_dir, "index.html"))
+
+
+def test_write_redirect_stubs_link_locales_that_are_not_built():
+    """Test that stubs send readers of locales that are not built to production"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_dir=temp_dir, use_directory_urls=False)
+        locale_en = create_test_locale("English", "/en/", "en")
+        locale_zh = create_test_locale("中文", "/zh/", "zh")
+        mapper = LocaleMapper()
+        mapper.initialize([locale_en, locale_zh])
+        manager = RedirectStubManager(
+            [locale_en, locale_zh],
+            mapper,
+            locale_en,
+            links={"en": "https://example.com/sub/en/"},
+        )
+        counterparts = {
+            ("docs/guide.html", "en"): "/en/docs/guide.html",
+            ("docs/guide.html", "zh"): "/zh/docs/guide.html",
+            ("docs/api.html", "zh"): "/zh/docs/api.html",
+        }
+
+        assert manager.write_redirect_stubs(config, counterparts) == 2
+        assert '"en": "https://example.com/sub/en/"' in manager.generate_script()
+
+        with open(os.path.join(temp_dir, "docs", "guide.html"), encoding="utf-8") as f:
+            stub = f.read()
+        assert 'data-links="https://example.com/sub/en/ /zh/"' in stub
+        assert 'content="0;url=https://example.com/sub/en/docs/guide.html"' in stub
+
+        with open(os.path.join(temp_dir, "docs", "api.html"), encoding="utf-8") as f:
+            assert 'content="0;url=../zh/docs/api.html"' in f.read()
+
+
+def test_write_redirect_stubs_keeps_built_files():
+    """Test that stubs never replace files of the build"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_dir=temp_dir, use_directory_urls=False)
+        with open(os.path.join(temp_dir, "guide.html"), "w", encoding="utf-8") as f:
+            f.write("content")
+
+        manager = create_test_stub_manager()
+        counterparts = {("guide.html", "en"): "/en/guide.html"}
+
+        assert manager.write_redirect_stubs(config, counterparts) == 0
+        with open(os.path.join(temp_dir, "guide.html"), encoding="utf-8") as f:
+            assert f.read() == "content"
+
+
+def test_redirect_script_is_content_hashed():
+    """Test that the script name only changes with its content"""
+    manager = create_test_stub_manager()
+
+    assert manager.generate_script() == create_test_stub_manager().generate_script()
+    assert '"zh": "/zh/"' in manager.generate_script()
+
+
+def test_redirect_script_reads_remembered_language():
+    """Test that the remembered language is read inside rememberedLang()"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    mapper = LocaleMapper()
+    mapper.initialize([locale_en])
+    script = RedirectStubManager(
+        [locale_en], mapper, locale_en, "cookie"
+    ).generate_script()
+
+    assert (
+        "  function rememberedLang() {\n" "    const match = document.cookie.match("
+    ) in script
+    assert "\n    return match ? decodeURIComponent(match[1]) : null;\n  }" in script
@@ -0,0 +1,116 @@
+"""Tests for search index sharding in MkDocs Material i18n Plugin"""
+
+import json
+import re
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
+
+from mkdocs_material_i18n.config import LocaleConfig
+from mkdocs_material_i18n.locale_mapper import LocaleMapper
+from mkdocs_material_i18n.search import (
+    SearchIndexManager,
+    build_search_shard,
+    segment_cjk,
+)
+
+
+def create_test_locale(name: str, link: str, lang: str) -> LocaleConfig:
+    """Helper function to create a test locale configuration"""
+    locale = LocaleConfig()
+    locale.load_dict({"name": name, "link": link, "lang": lang})
+    return locale
+
+
+def create_test_manager(**kwargs) -> SearchIndexManager:
+    """Helper function to create a search index manager for English and Chinese"""
+    locales = [
+        create_test_locale("English", "/en/", "en"),
+        create_test_locale("中文", "/zh/", "zh"),
+    ]
+    mapper = LocaleMapper()
+    mapper.initialize(locales)
+    return SearchIndexManager(locales, mapper, **kwargs)
+
+
+def create_test_index() -> dict:
+    """Helper function to create a search index like Material's search plugin"""
+    return {
+        "config": {"lang": ["en", "zh"], "separator": "[\\s\\-]+", "pipeline": []},
+        "docs": [
+            {"location": "", "title": "Home", "text": ""},
+            {"location": "en/", "title": "Home", "text": "Welcome"},
+            {"location": "en/guide/#setup", "title": "Setup", "text": "Install it"},
+            {"location": "zh/", "title": "首页", "text": "欢迎使用"},
+        ],
+    }
+
+
+def test_split_search_index():
+    """Test that documents are grouped by locale with site-relative locations"""
+    manager = create_test_manager()
+    shards = manager.split_search_index(create_test_index())
+
+    assert [doc["location"] for doc in shards["en"]["docs"]] == [
+        "en/",
+        "en/guide/#setup",
+    ]
+    assert [doc["title"] for doc in shards["zh"]["docs"]] == ["首页"]
+
+
+def test_search_shard_script_keeps_base():
+    """Test that only the search index of a locale page is redirected to its shard"""
+    manager = create_test_manager()
+    page = Page(None, File("en/guide.md", "docs", "site", True), MkDocsConfig())
+    output = '<script id="__config" type="application/json">{"base": "../.."}</script>'
+
+    result = manager.add_search_shard_script(output, page)
+    assert result.endswith(output)
+    assert 'new URL("../../",location.href)' in result
+    assert 'new URL("en/search/search_index.",b)' in result
+
+
+def test_build_search_shard_narrows_languages():
+    """Test that a shard only loads the search pipeline of its own language"""
+    shard = json.loads(build_search_shard("zh", create_test_index()))
+
+    assert shard["config"]["lang"] == ["zh"]
+    assert shard["config"]["separator"] == "[\\s\\-]+"
+
+
+def test_build_search_shard_with_segmenter():
+    """Test that a configured segmenter is applied to titles and texts"""
+    shard = json.loads(
+        build_search_shard(
+            "zh", create_test_index(), "mkdocs_material_i18n.search:segment_cjk"
+        )
+    )
+
+    assert shard["docs"][3]["title"] == "首\u200b页"
+    assert shard["docs"][3]["text"] == "欢\u200b迎\u200b使\u200b用"
+    assert shard["docs"][2]["text"] == "Install it"
+
+    # Search splits on the zero-width spaces between the tokens
+    assert shard["config"]["separator"] == "(?:[\\s\\-]+|\u200b)+"
+    assert re.split(shard["config"]["separator"], "首\u200b页 docs") == [
+        "首",
+        "页",
+        "docs",
+    ]
+
+
+def test_segment_cjk_keeps_other_scripts():
+    """Test that only runs of ideographs are segmented"""
+    assert segment_cjk("MkDocs 插件 i18n") == "MkDocs \u200b插\u200b件\u200b i18n"
+
+
+def test_parallel_shards_match_sequential():
+    """Test that building shards in a process pool gives the same result"""
+    segmenters = {"zh": "mkdocs_material_i18n.search:segment_cjk"}
+    sequential = create_test_manager(segmenters=segmenters)
+    parallel = create_test_manager(search_workers=2, segmenters=segmenters)
+
+    assert parallel.build_search_shards(
+        create_test_index()
+    ) == sequential.build_search_shards(create_test_index())
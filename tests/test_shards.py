@@ -0,0 +1,95 @@
+"""Tests for sharded builds of MkDocs Material i18n Plugin"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mkdocs_material_i18n.shards import (
+    ShardError,
+    build_shard,
+    get_shard_langs,
+    merge_shards,
+    read_manifest,
+)
+from mkdocs_material_i18n.split import MANIFEST_FILE
+
+from .test_split import create_test_project, read_site_file
+
+
+def test_get_shard_langs():
+    """Test that locales are dealt to shards in turn"""
+    langs = ["en", "zh", "ja", "fr", "de"]
+
+    assert get_shard_langs(langs, 1, 2) == ["en", "ja", "de"]
+    assert get_shard_langs(langs, 2, 2) == ["zh", "fr"]
+    with pytest.raises(ShardError):
+        get_shard_langs(langs, 3, 2)
+
+
+def test_shards_merge_into_one_site():
+    """Test that shards built apart are merged from their manifests alone"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(
+            temp_dir, ["en/index.md", "en/guide.md", "zh/index.md"]
+        )
+        shard_dirs = [os.path.join(temp_dir, f"shard-{n}") for n in (1, 2)]
+
+        manifest = build_shard(config_file, shard_dirs[1], index=2, count=2)
+        assert manifest["locales"] == ["zh"]
+        assert manifest["pages"] == ["/zh/"]
+        assert "zh/index.html" in manifest["files"]
+        assert "en/index.html" not in manifest["files"]
+        build_shard(config_file, shard_dirs[0], langs=["en"])
+
+        # Merging does not need the docs
+        shutil.rmtree(os.path.join(temp_dir, "docs"))
+        site_dir = os.path.join(temp_dir, "site")
+        assert merge_shards(config_file, shard_dirs, site_dir) == ["en", "zh"]
+
+        home = read_site_file(site_dir, "index.html")
+        assert '"en": "/en/"' in home and '"zh": "/zh/"' in home
+        assert os.path.exists(os.path.join(site_dir, "sitemap-en.xml.gz"))
+        assert not os.path.exists(os.path.join(site_dir, MANIFEST_FILE))
+
+        search_index = json.loads(read_site_file(site_dir, "search/search_index.json"))
+        assert search_index["docs"][0]["location"] == "en/"
+
+        # Shards are kept, so a merge can be repeated
+        assert os.path.exists(os.path.join(shard_dirs[0], "en", "index.html"))
+
+
+def test_shards_remember_language():
+    """Test that sites remembering the language can be sharded and merged"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(
+            temp_dir, ["en/index.md", "zh/index.md"], "remember_language: cookie"
+        )
+        shard_dirs = [os.path.join(temp_dir, f"shard-{n}") for n in (1, 2)]
+        for index, shard_dir in enumerate(shard_dirs, 1):
+            build_shard(config_file, shard_dir, index=index, count=2)
+
+        site_dir = os.path.join(temp_dir, "site")
+        assert merge_shards(config_file, shard_dirs, site_dir) == ["en", "zh"]
+        assert "document.cookie" in read_site_file(site_dir, "index.html")
+
+
+def test_merge_rejects_modified_shards():
+    """Test that shards whose files differ from their manifest are not merged"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(temp_dir, ["en/index.md", "zh/index.md"])
+        shard_dir = os.path.join(temp_dir, "shard")
+        build_shard(config_file, shard_dir, langs=["en"])
+        assert read_manifest(shard_dir)["locales"] == ["en"]
+
+        with open(os.path.join(shard_dir, "en", "index.html"), "a") as f:
+            f.write("<!-- changed -->")
+
+        with pytest.raises(ShardError, match="does not match its manifest"):
+            merge_shards(config_file, [shard_dir], os.path.join(temp_dir, "site"))
+        with pytest.raises(ShardError, match="built by both"):
+            merge_shards(
+                config_file, [shard_dir, shard_dir], os.path.join(temp_dir, "site")
+            )
@@ -0,0 +1,101 @@
+"""Tests for per-locale sitemap generation in MkDocs Material i18n Plugin"""
+
+import gzip
+import os
+import tempfile
+from types import SimpleNamespace
+from xml.etree import ElementTree
+
+from mkdocs_material_i18n.config import LocaleConfig
+from mkdocs_material_i18n.sitemap import SITEMAP_INDEX_FILE, SitemapManager
+
+NS = {
+    "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "xhtml": "http://www.w3.org/1999/xhtml",
+}
+
+
+def create_test_locale(name: str, link: str, lang: str) -> LocaleConfig:
+    """Helper function to create a test locale configuration"""
+    locale = LocaleConfig()
+    locale.load_dict({"name": name, "link": link, "lang": lang})
+    return locale
+
+
+def create_test_manager(**kwargs) -> SitemapManager:
+    """Helper function to create a sitemap manager for English and Chinese"""
+    locale_en = create_test_locale("English", "/en/", "en")
+    locale_zh = create_test_locale("中文", "/zh/", "zh")
+    return SitemapManager([locale_en, locale_zh], locale_en, **kwargs)
+
+
+COUNTERPARTS = {
+    ("", "en"): "/en/",
+    ("guide/", "en"): "/en/guide/",
+    ("api/", "en"): "/en/api/",
+    ("", "zh"): "/zh/",
+    ("guide/", "zh"): "/zh/guide/",
+}
+
+
+def read_sitemap(site_dir: str, name: str) -> ElementTree.Element:
+    """Helper function to parse a gzipped sitemap"""
+    with gzip.open(os.path.join(site_dir, name)) as f:
+        return ElementTree.parse(f).getroot()
+
+
+def test_write_sitemaps_with_alternates():
+    """Test that every locale gets a sitemap linking the translations of its pages"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_url="https://example.com/docs", site_dir=temp_dir)
+        names = create_test_manager().write_sitemaps(config, COUNTERPARTS)
+
+        assert names == ["sitemap-en.xml.gz", "sitemap-zh.xml.gz"]
+
+        urlset = read_sitemap(temp_dir, "sitemap-zh.xml.gz")
+        assert [loc.text for loc in urlset.findall("sm:url/sm:loc", NS)] == [
+            "https://example.com/docs/zh/",
+            "https://example.com/docs/zh/guide/",
+        ]
+        links = urlset.findall("sm:url", NS)[1].findall("xhtml:link", NS)
+        assert {link.get("hreflang"): link.get("href") for link in links} == {
+            "en": "https://example.com/docs/en/guide/",
+            "zh": "https://example.com/docs/zh/guide/",
+            "x-default": "https://example.com/docs/en/guide/",
+        }
+
+        # Untranslated pages have no alternates
+        urlset = read_sitemap(temp_dir, "sitemap-en.xml.gz")
+        assert urlset.findall("sm:url", NS)[2].findall("xhtml:link", NS) == []
+
+        index = ElementTree.parse(os.path.join(temp_dir, SITEMAP_INDEX_FILE))
+        assert [
+            loc.text for loc in index.getroot().findall("sm:sitemap/sm:loc", NS)
+        ] == [
+            "https://example.com/docs/sitemap-en.xml.gz",
+            "https://example.com/docs/sitemap-zh.xml.gz",
+        ]
+
+
+def test_write_sitemaps_splits_large_locales():
+    """Test that sitemaps are split once a locale exceeds the URL limit"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_url="https://example.com/", site_dir=temp_dir)
+        names = create_test_manager(max_urls=2).write_sitemaps(config, COUNTERPARTS)
+
+        assert names == [
+            "sitemap-en-1.xml.gz",
+            "sitemap-en-2.xml.gz",
+            "sitemap-zh.xml.gz",
+        ]
+        assert len(read_sitemap(temp_dir, "sitemap-en-1.xml.gz")) == 2
+        assert len(read_sitemap(temp_dir, "sitemap-en-2.xml.gz")) == 1
+
+
+def test_write_sitemaps_requires_site_url():
+    """Test that no sitemaps are written without a site_url"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = SimpleNamespace(site_url=None, site_dir=temp_dir)
+
+        assert create_test_manager().write_sitemaps(config, COUNTERPARTS) == []
+        assert os.listdir(temp_dir) == []
@@ -0,0 +1,116 @@
+"""Tests for split builds of MkDocs Material i18n Plugin"""
+
+import json
+import os
+import tempfile
+
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+from mkdocs_material_i18n.split import build_partial, split_build, split_mode
+
+CONFIG = """site_name: Test Site
+site_url: https://example.com/
+theme:
+  name: material
+plugins:
+  - search
+  - i18n:
+      sitemaps: true{options}
+      locales:
+        - name: English
+          link: /en/
+          lang: en
+        - name: 中文
+          link: /zh/
+          lang: zh
+"""
+
+
+def create_test_project(root: str, src_uris, options: str = "") -> str:
+    """Helper function to create a site with the given pages and plugin options and return its config file"""
+    for src_uri in src_uris:
+        path = os.path.join(root, "docs", src_uri)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {src_uri}\n")
+
+    config_file = os.path.join(root, "mkdocs.yml")
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write(
+            CONFIG.format(
+                options="".join(f"\n      {option}" for option in options.splitlines())
+            )
+        )
+    return config_file
+
+
+def read_site_file(site_dir: str, path: str) -> str:
+    """Helper function to read a file of a built site"""
+    with open(os.path.join(site_dir, path), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_split_build_merges_locale_builds():
+    """Test that locales built in separate processes form one site"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(
+            temp_dir,
+            ["about.md", "en/index.md", "en/guide.md", "zh/index.md", "zh/guide.md"],
+        )
+        site_dir = os.path.join(temp_dir, "site")
+
+        assert split_build(config_file, site_dir, workers=2) == ["en", "zh"]
+
+        # Alternates link the other locale within the site
+        zh_guide = read_site_file(site_dir, "zh/guide/index.html")
+        assert 'href="/en/guide/" hreflang="en"' in zh_guide
+
+        # Files linking every locale are written once for the whole site
+        home = read_site_file(site_dir, "index.html")
+        assert '"en": "/en/"' in home and '"zh": "/zh/"' in home
+        assert os.path.exists(os.path.join(site_dir, "sitemap-zh.xml.gz"))
+
+        search_index = json.loads(read_site_file(site_dir, "search/search_index.json"))
+        locations = [doc["location"] for doc in search_index["docs"]]
+        assert {"en/guide/", "zh/guide/"} <= set(locations)
+
+        # Pages of no locale, built by every locale build, are listed once
+        assert locations.count("about/") == 1
+        sitemap = read_site_file(site_dir, "sitemap.xml")
+        assert "https://example.com/en/guide/" in sitemap
+        assert "https://example.com/zh/guide/" in sitemap
+        assert sitemap.count("https://example.com/about/<") == 1
+
+        # Staging directories are removed
+        assert sorted(os.listdir(temp_dir)) == ["docs", "mkdocs.yml", "site"]
+
+
+def test_split_build_remembers_language():
+    """Test that the files linking every locale are written outside of MkDocs events"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(
+            temp_dir, ["en/index.md", "zh/index.md"], "remember_language: cookie"
+        )
+        site_dir = os.path.join(temp_dir, "site")
+
+        assert split_build(config_file, site_dir, workers=2) == ["en", "zh"]
+        assert "document.cookie" in read_site_file(site_dir, "index.html")
+
+
+def test_split_mode_ends_with_its_build():
+    """Test that whole builds after a partial build of the same site write every file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_file = create_test_project(temp_dir, ["en/index.md", "zh/index.md"])
+        build_partial(config_file, ["zh"], os.path.join(temp_dir, "partial"))
+        assert not os.path.exists(os.path.join(temp_dir, "partial", "index.html"))
+
+        config = load_config(config_file, site_dir=os.path.join(temp_dir, "site"))
+        with split_mode(config, ["en"]) as plugin:
+            assert plugin.split_build
+        assert not plugin.split_build
+        assert plugin.config.build_locales == []
+
+        build(config)
+        assert '"en": "/en/"' in read_site_file(config.site_dir, "index.html")
+        assert os.path.exists(os.path.join(config.site_dir, "zh", "index.html"))